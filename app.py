@@ -3,7 +3,7 @@ import threading
 from flask import Flask, jsonify, request, render_template
 from config import SECRET_KEY
 from db import init_db, get_db_connection
-from selector import select_next_album
+from selector import select_next_album, select_next_albums, sampler, prefetch_next_album
 from bigboard_sync import normalize_for_matching
 
 app = Flask(__name__)
@@ -17,6 +17,8 @@ app.jinja_env.auto_reload = True
 # Track sync state
 sync_status = {"in_progress": False, "type": None, "message": "", "current": 0, "total": 0}
 sync_lock = threading.Lock()
+# Set by /api/sync/cancel; honoured by the master-year backfill
+sync_cancel = threading.Event()
 
 
 def api_response(success=True, data=None, message="", status_code=200):
@@ -35,6 +37,23 @@ def index():
 
 @app.route("/api/next")
 def next_album():
+    if "count" in request.args:
+        # Batch mode: a queue of picks, variety rules applied between them
+        try:
+            count = int(request.args["count"])
+        except ValueError:
+            return api_response(False, message="count must be an integer.", status_code=400)
+        if count < 1:
+            return api_response(False, message="count must be at least 1.", status_code=400)
+        results = select_next_albums(count)
+        if not results:
+            return api_response(
+                False,
+                message="No eligible albums found. Sync your collection or un-exclude some albums.",
+                status_code=404,
+            )
+        return api_response(data=results)
+
     result = select_next_album()
     if result is None:
         return api_response(
@@ -90,10 +109,11 @@ def previous_album():
         styles = json.loads(album["styles"]) if album["styles"] else []
 
         cursor.execute(
-            "SELECT COUNT(*) FROM listens WHERE album_id = ?",
+            "SELECT selection_count FROM album_listen_summary WHERE album_id = ?",
             (album["id"],),
         )
-        times_played = cursor.fetchone()[0]
+        summary = cursor.fetchone()
+        times_played = summary["selection_count"] if summary else 0
 
         return api_response(data={
             "album_id": album["id"],
@@ -128,13 +148,15 @@ def mark_listened(album_id):
             """UPDATE listens SET did_listen = 1, skipped = 0
                WHERE id = (
                    SELECT id FROM listens WHERE album_id = ?
-                   ORDER BY selected_at DESC LIMIT 1
+                   ORDER BY selected_epoch DESC, id DESC LIMIT 1
                )""",
             (album_id,),
         )
         if cursor.rowcount == 0:
             return api_response(False, message="No selection found for this album.", status_code=404)
         conn.commit()
+        # The user is about to ask for the next record
+        prefetch_next_album()
         return api_response(message="Marked as listened.")
     finally:
         conn.close()
@@ -149,13 +171,15 @@ def mark_skipped(album_id):
             """UPDATE listens SET skipped = 1, did_listen = 0
                WHERE id = (
                    SELECT id FROM listens WHERE album_id = ?
-                   ORDER BY selected_at DESC LIMIT 1
+                   ORDER BY selected_epoch DESC, id DESC LIMIT 1
                )""",
             (album_id,),
         )
         if cursor.rowcount == 0:
             return api_response(False, message="No selection found for this album.", status_code=404)
         conn.commit()
+        # The user is about to ask for the next record
+        prefetch_next_album()
         return api_response(message="Marked as skipped.")
     finally:
         conn.close()
@@ -171,6 +195,7 @@ def just_played(album_id):
             (album_id,),
         )
         conn.commit()
+        sampler.record_selection(album_id)
         return api_response(message="Recorded play.")
     finally:
         conn.close()
@@ -188,6 +213,7 @@ def exclude_album(album_id):
         if cursor.rowcount == 0:
             return api_response(False, message="Album not found.", status_code=404)
         conn.commit()
+        sampler.set_excluded(album_id, True)
         return api_response(message="Album excluded from future selections.")
     finally:
         conn.close()
@@ -205,6 +231,7 @@ def unexclude_album(album_id):
         if cursor.rowcount == 0:
             return api_response(False, message="Album not found.", status_code=404)
         conn.commit()
+        sampler.set_excluded(album_id, False)
         return api_response(message="Album re-included in selections.")
     finally:
         conn.close()
@@ -235,7 +262,7 @@ def listening_history():
                LEFT JOIN big_board_entries bb ON bb.album_id = a.id
                    AND bb.rank = (SELECT MIN(bb2.rank) FROM big_board_entries bb2 WHERE bb2.album_id = a.id)
                WHERE l.did_listen = 1 OR l.skipped = 1
-               ORDER BY l.selected_at DESC
+               ORDER BY l.selected_epoch DESC, l.id DESC
                LIMIT ? OFFSET ?""",
             (per_page, offset),
         )
@@ -289,15 +316,15 @@ def collection_stats():
         ranked = cursor.fetchone()[0]
 
         cursor.execute(
-            """SELECT COUNT(DISTINCT album_id) FROM listens WHERE did_listen = 1"""
+            """SELECT COUNT(CASE WHEN play_count > 0 THEN 1 END) AS unique_listened,
+                      COALESCE(SUM(play_count), 0) AS total_listens,
+                      COALESCE(SUM(skip_count), 0) AS total_skips
+               FROM album_listen_summary"""
         )
-        unique_listened = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM listens WHERE did_listen = 1")
-        total_listens = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM listens WHERE skipped = 1")
-        total_skips = cursor.fetchone()[0]
+        row = cursor.fetchone()
+        unique_listened = row["unique_listened"]
+        total_listens = row["total_listens"]
+        total_skips = row["total_skips"]
 
         cursor.execute(
             "SELECT synced_at FROM sync_log WHERE sync_type = 'discogs' ORDER BY id DESC LIMIT 1"
@@ -464,15 +491,14 @@ def listening_stats():
             """SELECT a.id, a.artist, a.title, a.release_year, a.master_year,
                       a.master_year_override, a.cover_image_url,
                       a.genres, bb.rank AS big_board_rank, bb.year AS big_board_year,
-                      COUNT(l.id) as listen_count,
-                      MIN(l.selected_at) as first_listened,
-                      MAX(l.selected_at) as last_listened
+                      s.play_count as listen_count,
+                      datetime(s.first_played, 'unixepoch') as first_listened,
+                      datetime(s.last_played, 'unixepoch') as last_listened
                FROM albums a
-               JOIN listens l ON l.album_id = a.id AND l.did_listen = 1
+               JOIN album_listen_summary s ON s.album_id = a.id AND s.play_count > 0
                LEFT JOIN big_board_entries bb ON bb.album_id = a.id
                    AND bb.rank = (SELECT MIN(bb2.rank) FROM big_board_entries bb2 WHERE bb2.album_id = a.id)
                WHERE a.is_removed = 0
-               GROUP BY a.id
                ORDER BY listen_count DESC, a.artist, a.title"""
         )
         rows = cursor.fetchall()
@@ -564,16 +590,12 @@ def album_detail(album_id):
         styles = json.loads(album["styles"]) if album["styles"] else []
 
         cursor.execute(
-            "SELECT COUNT(*) FROM listens WHERE album_id = ? AND did_listen = 1",
-            (album_id,),
-        )
-        times_played = cursor.fetchone()[0]
-
-        cursor.execute(
-            "SELECT COUNT(*) FROM listens WHERE album_id = ? AND skipped = 1",
+            "SELECT play_count, skip_count FROM album_listen_summary WHERE album_id = ?",
             (album_id,),
         )
-        times_skipped = cursor.fetchone()[0]
+        summary = cursor.fetchone()
+        times_played = summary["play_count"] if summary else 0
+        times_skipped = summary["skip_count"] if summary else 0
 
         return api_response(data={
             "album_id": album["id"],
@@ -608,7 +630,7 @@ def album_play_dates(album_id):
         cursor.execute(
             """SELECT selected_at FROM listens
                WHERE album_id = ? AND did_listen = 1
-               ORDER BY selected_at DESC""",
+               ORDER BY selected_epoch DESC""",
             (album_id,),
         )
         rows = cursor.fetchall()
@@ -637,7 +659,7 @@ def set_album_master(album_id):
             cursor.execute(
                 """UPDATE albums SET master_id_override = NULL,
                       discogs_master_id = NULL, master_url = NULL, master_year = NULL,
-                      updated_at = CURRENT_TIMESTAMP
+                      content_hash = NULL, updated_at = CURRENT_TIMESTAMP
                    WHERE id = ?""",
                 (album_id,),
             )
@@ -670,6 +692,7 @@ def set_album_master(album_id):
                 )
 
         conn.commit()
+        sampler.invalidate()
         return api_response(message="Master release updated.")
     except ValueError:
         return api_response(False, message="Invalid master ID.", status_code=400)
@@ -704,6 +727,7 @@ def set_album_year(album_id):
             )
 
         conn.commit()
+        sampler.invalidate()
         return api_response(message="Original release year updated.")
     except ValueError:
         return api_response(False, message="Invalid year.", status_code=400)
@@ -751,6 +775,7 @@ def set_album_release(album_id):
             params,
         )
         conn.commit()
+        sampler.invalidate()
         return api_response(message="Discogs release updated.")
     except ValueError:
         return api_response(False, message="Invalid release ID.", status_code=400)
@@ -788,6 +813,7 @@ def use_release_as_master(album_id):
             (cover_image_url, album_id),
         )
         conn.commit()
+        sampler.invalidate()
         return api_response(message="Cover image refreshed from release.")
     except Exception as e:
         return api_response(False, message=str(e), status_code=500)
@@ -882,6 +908,7 @@ def update_bigboard_entry(rank):
             params,
         )
         conn.commit()
+        sampler.invalidate()
         return api_response(message="Big Board entry updated.")
     except ValueError:
         return api_response(False, message="Invalid year.", status_code=400)
@@ -941,6 +968,7 @@ def match_bigboard():
         )
 
         conn.commit()
+        sampler.invalidate()
         return api_response(message=f"Album matched to Big Board rank #{rank}.")
     except ValueError:
         return api_response(False, message="Invalid album_id or rank.", status_code=400)
@@ -989,6 +1017,7 @@ def unmatch_bigboard():
             )
 
         conn.commit()
+        sampler.invalidate()
         return api_response(message="Big Board rank removed.")
     except ValueError:
         return api_response(False, message="Invalid album_id.", status_code=400)
@@ -1036,16 +1065,8 @@ def set_bigboard_via(rank):
 
 def _fetch_master_data(master_id):
     """Fetch year and cover image from Discogs master release."""
-    import requests
-    from config import DISCOGS_TOKEN, DISCOGS_USER_AGENT
-    headers = {
-        "Authorization": f"Discogs token={DISCOGS_TOKEN}",
-        "User-Agent": DISCOGS_USER_AGENT,
-    }
-    url = f"https://api.discogs.com/masters/{master_id}"
-    resp = requests.get(url, headers=headers, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
+    from discogs_client import get_client
+    data = get_client().get_json(f"/masters/{master_id}")
     cover = None
     images = data.get("images", [])
     if images:
@@ -1055,16 +1076,8 @@ def _fetch_master_data(master_id):
 
 def _fetch_release_data(release_id):
     """Fetch basic data from a Discogs release."""
-    import requests
-    from config import DISCOGS_TOKEN, DISCOGS_USER_AGENT
-    headers = {
-        "Authorization": f"Discogs token={DISCOGS_TOKEN}",
-        "User-Agent": DISCOGS_USER_AGENT,
-    }
-    url = f"https://api.discogs.com/releases/{release_id}"
-    resp = requests.get(url, headers=headers, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
+    from discogs_client import get_client
+    data = get_client().get_json(f"/releases/{release_id}")
     cover = None
     images = data.get("images", [])
     if images:
@@ -1117,8 +1130,9 @@ def save_settings():
 
 # --- Sync API ---
 
-def run_sync(sync_type):
+def run_sync(sync_type, options=None):
     """Run a sync operation in a background thread."""
+    options = options or {}
     global sync_status
 
     def progress_callback(message, current, total):
@@ -1129,10 +1143,12 @@ def run_sync(sync_type):
     try:
         if sync_type == "discogs":
             from discogs_sync import sync_collection
-            results = sync_collection(progress_callback=progress_callback)
+            results = sync_collection(
+                progress_callback=progress_callback, mode=options.get("mode", "auto")
+            )
             sync_status["message"] = (
                 f"Done! Added {results['added']}, updated {results['updated']}, "
-                f"removed {results['removed']}."
+                f"removed {results['removed']} ({results['mode']} sync)."
             )
         elif sync_type == "bigboard":
             from bigboard_sync import sync_big_board
@@ -1147,19 +1163,38 @@ def run_sync(sync_type):
             )
         elif sync_type == "master_years":
             from master_year_sync import sync_master_years
-            results = sync_master_years(progress_callback=progress_callback)
+            results = sync_master_years(
+                progress_callback=progress_callback, cancel_event=sync_cancel
+            )
+            verb = "Cancelled" if results["cancelled"] else "Done"
             sync_status["message"] = (
-                f"Done! Fetched {results['fetched']} master years. "
-                f"{results['errors']} errors, {results['remaining']} remaining."
+                f"{verb}! Fetched {results['fetched']} master years "
+                f"({results['albums_updated']} albums). "
+                f"{results['errors']} errors, {results['remaining']} masters remaining."
             )
     except Exception as e:
         sync_status["message"] = f"Error: {e}"
     finally:
+        # Syncs can touch any album, so rebuild the selection pool in the
+        # background rather than on the next click
+        sampler.invalidate()
+        prefetch_next_album()
         sync_status["in_progress"] = False
 
 
 @app.route("/api/sync/discogs", methods=["POST"])
 def sync_discogs():
+    from discogs_sync import SYNC_MODES
+
+    body = request.get_json(silent=True) or {}
+    mode = body.get("mode", "auto")
+    if mode not in SYNC_MODES:
+        return api_response(
+            False,
+            message=f"mode must be one of: {', '.join(SYNC_MODES)}.",
+            status_code=400,
+        )
+
     with sync_lock:
         if sync_status["in_progress"]:
             return api_response(
@@ -1173,7 +1208,7 @@ def sync_discogs():
         sync_status["current"] = 0
         sync_status["total"] = 0
 
-    thread = threading.Thread(target=run_sync, args=("discogs",), daemon=True)
+    thread = threading.Thread(target=run_sync, args=("discogs", {"mode": mode}), daemon=True)
     thread.start()
     return api_response(message="Discogs sync started.")
 
@@ -1212,12 +1247,21 @@ def sync_master_years():
         sync_status["message"] = "Starting master year fetch..."
         sync_status["current"] = 0
         sync_status["total"] = 0
+        sync_cancel.clear()
 
     thread = threading.Thread(target=run_sync, args=("master_years",), daemon=True)
     thread.start()
     return api_response(message="Master year fetch started.")
 
 
+@app.route("/api/sync/cancel", methods=["POST"])
+def cancel_sync():
+    if not sync_status["in_progress"] or sync_status["type"] != "master_years":
+        return api_response(False, message="No cancellable sync is running.", status_code=409)
+    sync_cancel.set()
+    return api_response(message="Cancelling — saving what has been fetched so far.")
+
+
 @app.route("/api/sync/status")
 def get_sync_status():
     return api_response(data={
@@ -0,0 +1,290 @@
+"""Benchmark the Discogs sync paths against the local stand-in server.
+
+For each collection size, runs against a fresh temporary database:
+  1. a full collection sync (every release is new)
+  2. a second full sync (nothing changed)
+  3. the master-year backfill
+
+With --write-path, skips the HTTP side and compares how fast fetched pages
+are written: the original per-row path (a SELECT per release, a second
+SELECT for the master override, then an INSERT or UPDATE) against one
+executemany of UPSERT_ALBUM_SQL per page.
+
+Usage:
+    python bench_sync.py                       # 1k, 10k and 50k releases
+    python bench_sync.py --sizes 1000 --latency 0.2 --rate-limit 60
+    python bench_sync.py --write-path --sizes 10000
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import tempfile
+import time
+
+
+def _serve(size, options, ready):
+    """Child process: serve a generated collection of `size` releases."""
+    from discogs_standin import StandinServer, generate_fixture
+
+    server = StandinServer(generate_fixture(size), **options)
+    ready.put((server.url, len(server.fixture["masters"])))
+    server.serve_forever()
+
+
+def _start_standin(size, options):
+    """
+    Run the stand-in in its own process, so serving requests doesn't compete
+    with the sync for the GIL. Returns (process, url, master count).
+    """
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(size, options, ready), daemon=True)
+    process.start()
+    url, masters = ready.get()
+    return process, url, masters
+
+
+def _reset_database(paths):
+    for path in paths:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+def _use_temp_database():
+    """
+    Point the app at a throwaway database and response cache. config reads
+    these at import, so call this before the app modules load.
+    Returns (db_path, cache_path).
+    """
+    workdir = tempfile.mkdtemp(prefix="recordselektah-bench-")
+    db_path = os.path.join(workdir, "bench.db")
+    cache_path = os.path.join(workdir, "cache.db")
+    os.environ["DATABASE_PATH"] = db_path
+    os.environ["DISCOGS_CACHE_PATH"] = cache_path
+    os.environ["DISCOGS_TOKEN"] = os.environ.get("DISCOGS_TOKEN") or "bench"
+    os.environ["DISCOGS_USERNAME"] = "bench"
+    return db_path, cache_path
+
+
+def run_benchmark(sizes, latency=0.0, rate_limit=1_000_000, error_rate=0.0,
+                  throttle_rate=0.0, workers=None, skip_masters=False, report=None):
+    """
+    Run the benchmark and return a list of result rows (dicts).
+    report(row) is called as each phase finishes.
+    """
+    db_path, cache_path = _use_temp_database()
+    standin_options = {
+        "latency": latency,
+        "rate_limit": rate_limit,
+        "error_rate": error_rate,
+        "throttle_rate": throttle_rate,
+    }
+
+    import discogs_client
+    from db import init_db
+    from discogs_sync import sync_collection
+    from master_year_sync import sync_master_years
+    from config import MASTER_YEAR_WORKERS
+
+    rows = []
+    for size in sizes:
+        process, url, masters = _start_standin(size, standin_options)
+        try:
+            _reset_database([db_path, cache_path])
+            client = discogs_client.DiscogsClient(
+                base_url=url, cache=discogs_client.ResponseCache()
+            )
+            discogs_client._client = client
+            # Count every response, retried ones included
+            responses = [0]
+            client.session.hooks["response"].append(
+                lambda resp, *args, **kwargs: responses.__setitem__(0, responses[0] + 1)
+            )
+            # init_db() prints a line per database; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                init_db()
+
+            def timed(label, fn, count):
+                requests_before = responses[0]
+                start = time.perf_counter()
+                fn()
+                elapsed = time.perf_counter() - start
+                row = {
+                    "size": size,
+                    "phase": label,
+                    "seconds": elapsed,
+                    "requests": responses[0] - requests_before,
+                    "per_second": count / elapsed if elapsed else 0.0,
+                }
+                rows.append(row)
+                if report:
+                    report(row)
+
+            timed("collection (cold)", lambda: sync_collection(mode="full"), size)
+            timed("collection (no changes)", lambda: sync_collection(mode="full"), size)
+            if not skip_masters:
+                timed(
+                    "master years",
+                    lambda: sync_master_years(workers=workers or MASTER_YEAR_WORKERS),
+                    masters,
+                )
+        finally:
+            process.terminate()
+            process.join()
+
+    return rows
+
+
+def _write_page_per_row(cursor, releases):
+    """The write path before UPSERT_ALBUM_SQL: up to three statements per release."""
+    for release in releases:
+        cursor.execute(
+            "SELECT id, is_removed FROM albums WHERE discogs_release_id = ?",
+            (release["discogs_release_id"],),
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(
+                """INSERT INTO albums
+                   (discogs_release_id, discogs_master_id, artist, title,
+                    release_year, cover_image_url, genres, styles, format,
+                    discogs_url, master_url, content_hash, artist_key, title_key)
+                   VALUES
+                   (:discogs_release_id, :discogs_master_id, :artist, :title,
+                    :release_year, :cover_image_url, :genres, :styles, :format,
+                    :discogs_url, :master_url, :content_hash, :artist_key, :title_key)""",
+                release,
+            )
+            continue
+
+        cursor.execute(
+            "SELECT master_id_override FROM albums WHERE discogs_release_id = ?",
+            (release["discogs_release_id"],),
+        )
+        if cursor.fetchone()["master_id_override"]:
+            # Keep master_id, master_url and cover_image_url
+            cursor.execute(
+                """UPDATE albums SET
+                       artist = :artist, title = :title, release_year = :release_year,
+                       genres = :genres, styles = :styles, format = :format,
+                       discogs_url = :discogs_url, content_hash = :content_hash,
+                       artist_key = :artist_key, title_key = :title_key,
+                       is_removed = 0, updated_at = CURRENT_TIMESTAMP
+                   WHERE discogs_release_id = :discogs_release_id""",
+                release,
+            )
+        else:
+            cursor.execute(
+                """UPDATE albums SET
+                       discogs_master_id = :discogs_master_id, artist = :artist,
+                       title = :title, release_year = :release_year,
+                       cover_image_url = :cover_image_url, genres = :genres,
+                       styles = :styles, format = :format, discogs_url = :discogs_url,
+                       master_url = :master_url, content_hash = :content_hash,
+                       artist_key = :artist_key, title_key = :title_key,
+                       is_removed = 0, updated_at = CURRENT_TIMESTAMP
+                   WHERE discogs_release_id = :discogs_release_id""",
+                release,
+            )
+
+
+def run_write_benchmark(sizes, page_size=100, repeats=3, report=None):
+    """
+    Time writing a generated collection page by page, committing after each
+    page as sync_collection does, with the per-row path and with
+    UPSERT_ALBUM_SQL. Pages are parsed and hashed up front so only the
+    database writes are timed. Each path runs on a fresh database:
+      1. insert      — every release is new
+      2. re-sync     — every release changed (new cover URL)
+      3. unchanged   — nothing changed
+    and reports the best of `repeats` runs per phase.
+    Returns a list of result rows (dicts); report(row) is called for each.
+    """
+    db_path, cache_path = _use_temp_database()
+
+    from db import get_db_connection, init_db
+    from discogs_standin import generate_fixture
+    from discogs_sync import UPSERT_ALBUM_SQL, parse_release, release_hash
+
+    def write_upsert(cursor, releases):
+        cursor.executemany(UPSERT_ALBUM_SQL, releases)
+
+    paths = [("per-row", _write_page_per_row), ("upsert", write_upsert)]
+
+    rows = []
+    for size in sizes:
+        releases = [parse_release(item) for item in generate_fixture(size)["collection"]]
+        for release in releases:
+            release["content_hash"] = release_hash(release)
+        changed = []
+        for release in releases:
+            release = dict(release, cover_image_url=f"{release['cover_image_url']}?v=2")
+            release["content_hash"] = release_hash(release)
+            changed.append(release)
+        phases = [("insert", releases), ("re-sync", changed), ("unchanged", changed)]
+
+        for path, write_page in paths:
+            best = {}
+            for _ in range(repeats):
+                _reset_database([db_path])
+                with contextlib.redirect_stdout(io.StringIO()):
+                    init_db()
+                conn = get_db_connection()
+                try:
+                    cursor = conn.cursor()
+                    for phase, data in phases:
+                        start = time.perf_counter()
+                        for offset in range(0, len(data), page_size):
+                            write_page(cursor, data[offset:offset + page_size])
+                            conn.commit()
+                        elapsed = time.perf_counter() - start
+                        best[phase] = min(best.get(phase, elapsed), elapsed)
+                finally:
+                    conn.close()
+
+            for phase, _ in phases:
+                row = {
+                    "size": size,
+                    "phase": f"{phase} ({path})",
+                    "seconds": best[phase],
+                    "requests": 0,
+                    "per_second": size / best[phase] if best[phase] else 0.0,
+                }
+                rows.append(row)
+                if report:
+                    report(row)
+
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Discogs sync throughput offline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--latency", type=float, default=0.0, help="mean seconds per response")
+    parser.add_argument("--rate-limit", type=int, default=1_000_000,
+                        help="requests per minute the stand-in allows (Discogs: 60)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, help="master-year fetch workers")
+    parser.add_argument("--skip-masters", action="store_true")
+    parser.add_argument("--write-path", action="store_true",
+                        help="compare the per-row and upsert album writes, without HTTP")
+    args = parser.parse_args()
+
+    def print_row(row):
+        print(
+            f"{row['size']:>9}  {row['phase']:<24} {row['seconds']:>9.2f} "
+            f"{row['requests']:>9} {row['per_second']:>10.0f}",
+            flush=True,
+        )
+
+    print(f"{'releases':>9}  {'phase':<24} {'seconds':>9} {'requests':>9} {'items/s':>10}")
+    if args.write_path:
+        run_write_benchmark(args.sizes, report=print_row)
+        raise SystemExit(0)
+    run_benchmark(
+        args.sizes, latency=args.latency, rate_limit=args.rate_limit,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        workers=args.workers, skip_masters=args.skip_masters, report=print_row,
+    )
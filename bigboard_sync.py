@@ -1,13 +1,42 @@
 import csv
 import json
+import multiprocessing
 import re
-from thefuzz import fuzz
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from rapidfuzz import fuzz as rf_fuzz, process as rf_process
+from thefuzz import fuzz, utils as fuzz_utils
 from db import get_db_connection
-from config import BIG_BOARD_CSV_PATH
+from config import BIG_BOARD_CSV_PATH, BIG_BOARD_MATCH_WORKERS
 
 # Minimum fuzzy match score to consider a match
 MATCH_THRESHOLD = 80
 
+# Bump when normalize_for_matching changes, so stored album keys are rebuilt
+MATCH_KEY_VERSION = 1
+
+# Entries scored per batch in best_matches(); bounds the score matrices'
+# memory to a few MB each for collections of tens of thousands of albums
+SCORE_CHUNK_SIZE = 64
+
+# Albums fuzzy-scored per entry once the collection is larger than this;
+# picked by shared character trigrams (see AlbumMatcher)
+CANDIDATE_LIMIT = 100
+
+# Fewer entries than this to score aren't worth starting worker processes for
+PARALLEL_MIN_ENTRIES = 200
+
+# Threads rapidfuzz may use per cdist/cpdist call; worker processes use one
+# each so they don't oversubscribe the CPU between them
+_scorer_threads = -1
+
+_LEADING_THE = re.compile(r"^the\s+")
+_TRAILING_THE = re.compile(r",\s*the$")
+_DISAMBIGUATION = re.compile(r"\s*\(\d+\)\s*$")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
 
 def normalize_for_matching(text):
     """Normalize text for fuzzy matching: lowercase, strip 'the', remove punctuation."""
@@ -15,18 +44,73 @@ def normalize_for_matching(text):
         return ""
     text = text.lower().strip()
     # Remove leading "the "
-    text = re.sub(r"^the\s+", "", text)
+    text = _LEADING_THE.sub("", text)
     # Remove trailing ", the" (Discogs style)
-    text = re.sub(r",\s*the$", "", text)
+    text = _TRAILING_THE.sub("", text)
     # Strip parenthetical disambiguation like " (2)"
-    text = re.sub(r"\s*\(\d+\)\s*$", "", text)
+    text = _DISAMBIGUATION.sub("", text)
     # Remove punctuation
-    text = re.sub(r"[^\w\s]", "", text)
+    text = _PUNCTUATION.sub("", text)
     # Collapse whitespace
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _WHITESPACE.sub(" ", text).strip()
     return text
 
 
+def refresh_album_match_keys(cursor):
+    """
+    Fill in albums.artist_key/title_key where missing, or rebuild them all
+    if MATCH_KEY_VERSION changed. The Discogs sync writes keys as it goes,
+    so normally this only catches albums from before the columns existed.
+    Returns the number of albums updated.
+    """
+    cursor.execute("SELECT value FROM settings WHERE key = 'match_key_version'")
+    row = cursor.fetchone()
+    stale = not row or row["value"] != str(MATCH_KEY_VERSION)
+
+    where = "" if stale else "WHERE artist_key IS NULL OR title_key IS NULL"
+    cursor.execute(f"SELECT id, artist, title FROM albums {where}")
+    updates = [
+        (normalize_for_matching(row["artist"]), normalize_for_matching(row["title"]), row["id"])
+        for row in cursor.fetchall()
+    ]
+    cursor.executemany("UPDATE albums SET artist_key = ?, title_key = ? WHERE id = ?", updates)
+
+    if stale:
+        # Cached matches are keyed by the old normalization
+        cursor.execute("DELETE FROM bigboard_match_cache")
+        cursor.execute(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES ('match_key_version', ?)",
+            (str(MATCH_KEY_VERSION),),
+        )
+    return len(updates)
+
+
+def stamp_collection_version(cursor):
+    """
+    Return the collection version the Big Board matcher scores against.
+
+    The version is bumped whenever albums were added, removed or renamed
+    since the last call (the albums trigger leaves those with a NULL
+    match_version), and the changed albums are stamped with the new
+    version, so AlbumMatchCache can tell which albums are new to an entry.
+    """
+    cursor.execute("SELECT value FROM settings WHERE key = 'collection_version'")
+    row = cursor.fetchone()
+    version = int(row["value"]) if row else 0
+
+    cursor.execute("SELECT 1 FROM albums WHERE match_version IS NULL LIMIT 1")
+    if cursor.fetchone():
+        version += 1
+        cursor.execute(
+            "UPDATE albums SET match_version = ? WHERE match_version IS NULL", (version,)
+        )
+        cursor.execute(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES ('collection_version', ?)",
+            (str(version),),
+        )
+    return version
+
+
 def read_big_board_csv(csv_path=None):
     """Read the Big Board CSV and return a list of entries with their rank."""
     path = csv_path or BIG_BOARD_CSV_PATH
@@ -68,7 +152,11 @@ def read_big_board_csv(csv_path=None):
 def find_best_match(entry, albums):
     """
     Find the best matching album for a Big Board entry using fuzzy matching.
+    Albums must carry their normalized artist_key and title_key.
     Returns (album_row, score) or (None, 0).
+
+    This scores one pair at a time; sync_big_board uses the batched
+    best_matches(), which gives the same results.
     """
     entry_artist = normalize_for_matching(entry["artist"])
     entry_title = normalize_for_matching(entry["title"])
@@ -77,8 +165,8 @@ def find_best_match(entry, albums):
     best_score = 0
 
     for album in albums:
-        album_artist = normalize_for_matching(album["artist"])
-        album_title = normalize_for_matching(album["title"])
+        album_artist = album["artist_key"]
+        album_title = album["title_key"]
 
         # Score artist and title separately, then combine
         artist_score = fuzz.ratio(entry_artist, album_artist)
@@ -109,6 +197,436 @@ def find_best_match(entry, albums):
     return best_match, best_score
 
 
+class _ScorerInputs:
+    """
+    Distinct keys from a list, with the index of each item's key. Collections
+    repeat artists heavily, so scoring distinct strings and expanding the
+    result saves most of the artist work.
+
+    thefuzz's token scorers run their inputs through full_process (ASCII
+    only, lowercase, alphanumerics) first, so `processed` holds the same
+    preprocessed strings for the batched token scorers.
+    """
+
+    def __init__(self, keys):
+        positions = {}
+        self.index = np.array([positions.setdefault(k, len(positions)) for k in keys], dtype=np.intp)
+        self.keys = list(positions)
+        self.processed = [fuzz_utils.full_process(k, force_ascii=True) for k in self.keys]
+        self._postings = None
+
+    def token_postings(self):
+        """
+        Return ({token: [positions]}, irregular positions) over the processed
+        keys. Irregular keys have no tokens or repeat one, the cases where
+        token_set_ratio doesn't reduce to token_sort_ratio.
+        """
+        if self._postings is None:
+            postings = {}
+            irregular = []
+            for position, text in enumerate(self.processed):
+                tokens = text.split()
+                if not tokens or len(set(tokens)) != len(tokens):
+                    irregular.append(position)
+                for token in set(tokens):
+                    postings.setdefault(token, []).append(position)
+            self._postings = (postings, irregular)
+        return self._postings
+
+
+def _score_matrix(scorer, queries, choices):
+    """Score every query against every choice, rounded like thefuzz."""
+    scores = rf_process.cdist(
+        queries, choices, scorer=scorer, processor=None, dtype=np.float64, workers=_scorer_threads
+    )
+    return np.rint(scores)
+
+
+def _title_scores(entry_titles, album_titles):
+    """
+    max(ratio, token_sort_ratio, token_set_ratio) for titles, as in
+    find_best_match. Two titles that share no token (each with at least one
+    token and none repeated) get the same token_set_ratio as
+    token_sort_ratio, so token_set_ratio is only run on pairs that share a
+    token, found through album_titles' token postings.
+    """
+    scores = np.maximum(
+        _score_matrix(rf_fuzz.ratio, entry_titles.keys, album_titles.keys),
+        _score_matrix(rf_fuzz.token_sort_ratio, entry_titles.processed, album_titles.processed),
+    )
+    postings, irregular = album_titles.token_postings()
+
+    rows = []
+    columns = []
+    for row, query in enumerate(entry_titles.processed):
+        tokens = query.split()
+        if not tokens or len(set(tokens)) != len(tokens):
+            shared = range(len(album_titles.processed))
+        else:
+            shared = set(irregular)
+            for token in tokens:
+                shared.update(postings.get(token, ()))
+        rows.extend([row] * len(shared))
+        columns.extend(shared)
+    if not rows:
+        return scores
+
+    # Score just those pairs, element-wise
+    rows = np.array(rows, dtype=np.intp)
+    columns = np.array(columns, dtype=np.intp)
+    choices = np.array(album_titles.processed, dtype=object)
+    queries = np.array(entry_titles.processed, dtype=object)
+    token_set = np.rint(rf_process.cpdist(
+        queries[rows], choices[columns], scorer=rf_fuzz.token_set_ratio,
+        processor=None, dtype=np.float64, workers=_scorer_threads,
+    ))
+    scores[rows, columns] = np.maximum(scores[rows, columns], token_set)
+    return scores
+
+
+def _combined_scores(entry_artists, entry_titles, album_artists, album_titles):
+    """
+    The same scores as find_best_match, for a block of entries against all
+    albums at once: (entries x albums) matrix of weighted artist/title scores.
+    """
+    artist_best = np.maximum.reduce([
+        _score_matrix(rf_fuzz.ratio, entry_artists.keys, album_artists.keys),
+        _score_matrix(rf_fuzz.token_sort_ratio, entry_artists.processed, album_artists.processed),
+        _score_matrix(rf_fuzz.partial_ratio, entry_artists.keys, album_artists.keys),
+    ])
+    title_best = _title_scores(entry_titles, album_titles)
+
+    artist_best = artist_best[np.ix_(entry_artists.index, album_artists.index)]
+    title_best = title_best[np.ix_(entry_titles.index, album_titles.index)]
+    return artist_best * 0.4 + title_best * 0.6
+
+
+def best_matches(entries, albums, chunk_size=SCORE_CHUNK_SIZE):
+    """
+    Batched find_best_match: returns [(album_row, score) or (None, 0)] for
+    each entry, with the same results as calling find_best_match per entry.
+
+    Scores are computed as matrices over blocks of entries with rapidfuzz's
+    cdist, on distinct artist and title strings, and combined with the same
+    0.4/0.6 weighting as array operations.
+    """
+    if not albums:
+        return [(None, 0)] * len(entries)
+    positions = _best_positions(
+        entries,
+        _ScorerInputs([album["artist_key"] for album in albums]),
+        _ScorerInputs([album["title_key"] for album in albums]),
+        chunk_size,
+    )
+    return [(albums[p], score) if p is not None else (None, 0) for p, score in positions]
+
+
+def _best_positions(entries, album_artists, album_titles, chunk_size=SCORE_CHUNK_SIZE):
+    """best_matches, returning (album position, score) or (None, 0) per entry."""
+    if not album_artists.keys:
+        return [(None, 0)] * len(entries)
+    results = []
+    for start in range(0, len(entries), chunk_size):
+        chunk = entries[start:start + chunk_size]
+        combined = _combined_scores(
+            _ScorerInputs([normalize_for_matching(e["artist"]) for e in chunk]),
+            _ScorerInputs([normalize_for_matching(e["title"]) for e in chunk]),
+            album_artists,
+            album_titles,
+        )
+        best = combined.argmax(axis=1)
+        scores = combined[np.arange(len(chunk)), best]
+
+        for index, score in zip(best.tolist(), scores.tolist()):
+            # find_best_match only takes an album that scores above zero
+            results.append((index, score) if score > 0 else (None, 0))
+
+    return results
+
+
+def _trigrams(text):
+    """Distinct character trigrams of a normalized key, padded at the ends."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _TrigramIndex:
+    """
+    Inverted index from trigram to the positions of the keys containing it.
+    Trigrams are weighted by inverse document frequency, so rare ones count
+    for more than ones most keys share (" th", "ve ").
+    """
+
+    def __init__(self, keys):
+        postings = {}
+        for position, key in enumerate(keys):
+            for gram in _trigrams(key):
+                postings.setdefault(gram, []).append(position)
+        self.postings = {gram: np.array(p, dtype=np.intp) for gram, p in postings.items()}
+        self.size = len(keys)
+
+    def weight(self, gram):
+        return np.log((self.size + 1) / (len(self.postings.get(gram, ())) + 1)) + 1
+
+    def overlap(self, text):
+        """Weighted fraction of text's trigrams each key shares, as an array over keys."""
+        grams = _trigrams(text)
+        hits = [g for g in grams if g in self.postings]
+        if not hits:
+            return np.zeros(self.size)
+        weights = {g: self.weight(g) for g in grams}
+        positions = np.concatenate([self.postings[g] for g in hits])
+        gram_weights = np.concatenate([np.full(len(self.postings[g]), weights[g]) for g in hits])
+        shared = np.bincount(positions, weights=gram_weights, minlength=self.size)
+        return shared / sum(weights.values())
+
+
+class AlbumMatcher:
+    """
+    Matches Big Board entries against a fixed list of albums; build one per
+    sync_big_board run.
+
+    For collections larger than top_k, each entry is only fuzzy-scored
+    against the top_k albums sharing the largest fraction of its artist and
+    title trigrams (weighted 0.4/0.6 like the scores). A true match shares
+    most of its trigrams even when words are reordered, misspelled or
+    extended, so this finds the same matches as scoring every album while
+    doing a fixed amount of work per entry. The closest album reported for
+    an unmatched entry may differ, since weak candidates can be left out.
+    """
+
+    def __init__(self, albums, top_k=CANDIDATE_LIMIT):
+        self.albums = albums
+        self.top_k = top_k
+        self.artists = _ScorerInputs([album["artist_key"] for album in albums])
+        self.titles = _ScorerInputs([album["title_key"] for album in albums])
+        self.blocking = bool(top_k) and len(albums) > top_k
+        if self.blocking:
+            self.artist_index = _TrigramIndex(self.artists.keys)
+            self.title_index = _TrigramIndex(self.titles.keys)
+
+    def candidates(self, artist_key, title_key):
+        """Positions of the top_k albums by trigram overlap, in album order."""
+        overlap = (
+            self.artist_index.overlap(artist_key)[self.artists.index] * 0.4
+            + self.title_index.overlap(title_key)[self.titles.index] * 0.6
+        )
+        top = np.argpartition(-overlap, self.top_k - 1)[:self.top_k]
+        return np.sort(top)
+
+    def best_matches(self, entries, workers=1):
+        """
+        Same contract as best_matches(entries, albums). With workers > 1,
+        large batches are scored in a pool of worker processes, keeping the
+        work (and the GIL) out of the calling process; the results are the
+        same either way.
+        """
+        if workers > 1 and len(entries) >= PARALLEL_MIN_ENTRIES:
+            positions = self._parallel_positions(entries, workers)
+        else:
+            positions = self.match_positions(entries)
+        return [(self.albums[p], score) if p is not None else (None, 0) for p, score in positions]
+
+    def _parallel_positions(self, entries, workers):
+        album_keys = [(album["artist_key"], album["title_key"]) for album in self.albums]
+        plain = [{"artist": e["artist"], "title": e["title"]} for e in entries]
+        # A few chunks per worker evens out uneven chunks
+        size = -(-len(plain) // (workers * 4))
+        chunks = [plain[i:i + size] for i in range(0, len(plain), size)]
+        try:
+            # Spawned, not forked: this runs on the app's sync thread, and a
+            # fork of a threaded process can inherit a lock held elsewhere
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_match_worker,
+                initargs=(album_keys, self.top_k),
+            ) as pool:
+                return [result for chunk in pool.map(_match_chunk, chunks) for result in chunk]
+        except (OSError, BrokenProcessPool):
+            # Couldn't start or keep worker processes; score in-process
+            return self.match_positions(entries)
+
+    def match_positions(self, entries):
+        """Return (album position, score) or (None, 0) for each entry."""
+        if not self.blocking:
+            return _best_positions(entries, self.artists, self.titles)
+        if not entries:
+            return []
+
+        artist_keys = [normalize_for_matching(e["artist"]) for e in entries]
+        title_keys = [normalize_for_matching(e["title"]) for e in entries]
+        candidates = np.stack([
+            self.candidates(artist, title) for artist, title in zip(artist_keys, title_keys)
+        ])
+        pairs = candidates.ravel()
+        rows = np.repeat(np.arange(len(entries)), self.top_k)
+
+        combined = (
+            self._pair_scores(artist_keys, self.artists, rows, pairs, (
+                (rf_fuzz.ratio, False),
+                (rf_fuzz.token_sort_ratio, True),
+                (rf_fuzz.partial_ratio, False),
+            )) * 0.4
+            + self._pair_scores(title_keys, self.titles, rows, pairs, (
+                (rf_fuzz.ratio, False),
+                (rf_fuzz.token_sort_ratio, True),
+                (rf_fuzz.token_set_ratio, True),
+            )) * 0.6
+        ).reshape(len(entries), self.top_k)
+
+        # Candidates are in album order, so ties go to the earliest album
+        # like in find_best_match
+        best = combined.argmax(axis=1)
+        scores = combined[np.arange(len(entries)), best]
+        results = []
+        for row, (column, score) in enumerate(zip(best.tolist(), scores.tolist())):
+            position = int(candidates[row, column])
+            results.append((position, score) if score > 0 else (None, 0))
+        return results
+
+    @staticmethod
+    def _pair_scores(entry_keys, inputs, rows, pairs, scorers):
+        """Best of `scorers` for each (entry row, album position) pair, rounded like thefuzz."""
+        raw = np.array(entry_keys, dtype=object)
+        processed = np.array(
+            [fuzz_utils.full_process(k, force_ascii=True) for k in entry_keys], dtype=object
+        )
+        album_raw = np.array(inputs.keys, dtype=object)[inputs.index[pairs]]
+        album_processed = np.array(inputs.processed, dtype=object)[inputs.index[pairs]]
+
+        best = None
+        for scorer, preprocessed in scorers:
+            queries = processed[rows] if preprocessed else raw[rows]
+            choices = album_processed if preprocessed else album_raw
+            scores = np.rint(rf_process.cpdist(
+                queries, choices, scorer=scorer, processor=None,
+                dtype=np.float64, workers=_scorer_threads,
+            ))
+            best = scores if best is None else np.maximum(best, scores)
+        return best
+
+
+# Matcher held by each worker process in AlbumMatcher's process pool
+_worker_matcher = None
+
+
+def _init_match_worker(album_keys, top_k):
+    """Build the worker's read-only matcher from (artist_key, title_key) pairs."""
+    global _worker_matcher, _scorer_threads
+    _scorer_threads = 1
+    albums = [{"artist_key": artist, "title_key": title} for artist, title in album_keys]
+    _worker_matcher = AlbumMatcher(albums, top_k)
+
+
+def _match_chunk(entries):
+    return _worker_matcher.match_positions(entries)
+
+
+class AlbumMatchCache:
+    """
+    Best fuzzy match per entry key, persisted in bigboard_match_cache.
+
+    Each cached result records the collection version it was scored at. A
+    result from the current version is reused as is. An older one is only
+    scored against the albums that changed since, unless its best album is
+    among them (renamed or removed), in which case the entry is rescored
+    against the whole collection through AlbumMatcher.
+    """
+
+    def __init__(self, cursor, albums, version):
+        self.cursor = cursor
+        self.albums = albums
+        self.version = version
+        self.albums_by_id = {album["id"]: album for album in albums}
+        self.matcher = None
+        self.rescored = 0
+        self._changed = {}
+
+        cursor.execute(
+            """SELECT entry_artist_key, entry_title_key, album_id, score, collection_version
+               FROM bigboard_match_cache"""
+        )
+        self.rows = {
+            (row["entry_artist_key"], row["entry_title_key"]):
+                (row["album_id"], row["score"], row["collection_version"])
+            for row in cursor.fetchall()
+        }
+
+    def _changed_since(self, version):
+        """(ids of albums changed after version, those still in the collection)."""
+        if version not in self._changed:
+            self.cursor.execute("SELECT id FROM albums WHERE match_version > ?", (version,))
+            ids = {row["id"] for row in self.cursor.fetchall()}
+            self._changed[version] = (
+                ids, [album for album in self.albums if album["id"] in ids]
+            )
+        return self._changed[version]
+
+    def best_matches(self, entries, workers=1):
+        """Same contract as AlbumMatcher.best_matches; entries need a "key"."""
+        results = [None] * len(entries)
+        rescore = []
+        partial = {}
+        for i, entry in enumerate(entries):
+            cached = self.rows.get(entry["key"])
+            if cached is None:
+                rescore.append(i)
+                continue
+            album_id, score, version = cached
+            if album_id is not None and album_id not in self.albums_by_id:
+                rescore.append(i)
+            elif version == self.version:
+                results[i] = (self.albums_by_id.get(album_id), score)
+            elif album_id is not None and album_id in self._changed_since(version)[0]:
+                rescore.append(i)
+            else:
+                partial.setdefault(version, []).append(i)
+
+        # The cached best still stands unless a changed album beats it
+        for version, indices in partial.items():
+            changed = self._changed_since(version)[1]
+            scored = best_matches([entries[i] for i in indices], changed)
+            for i, (album, score) in zip(indices, scored):
+                album_id, cached_score, _ = self.rows[entries[i]["key"]]
+                if album is not None and (album_id is None or score > cached_score):
+                    results[i] = (album, score)
+                else:
+                    results[i] = (self.albums_by_id.get(album_id), cached_score)
+
+        if rescore:
+            self.matcher = self.matcher or AlbumMatcher(self.albums)
+            scored = self.matcher.best_matches([entries[i] for i in rescore], workers=workers)
+            for i, result in zip(rescore, scored):
+                results[i] = result
+            self.rescored += len(rescore)
+
+        writes = []
+        for entry, (album, score) in zip(entries, results):
+            row = (album["id"] if album else None, float(score), self.version)
+            if self.rows.get(entry["key"]) != row:
+                self.rows[entry["key"]] = row
+                writes.append(entry["key"] + row)
+        self.cursor.executemany(
+            """INSERT OR REPLACE INTO bigboard_match_cache
+               (entry_artist_key, entry_title_key, album_id, score, collection_version)
+               VALUES (?, ?, ?, ?, ?)""",
+            writes,
+        )
+        return results
+
+    def prune(self, keys):
+        """Drop cached results for entry keys no longer on the board."""
+        stale = [key for key in self.rows if key not in keys]
+        self.cursor.executemany(
+            """DELETE FROM bigboard_match_cache
+               WHERE entry_artist_key = ? AND entry_title_key = ?""",
+            stale,
+        )
+        for key in stale:
+            del self.rows[key]
+
+
 def _get_active_csv_path():
     """Return CSV path from DB settings if set, otherwise fall back to config."""
     try:
@@ -144,6 +662,7 @@ def sync_big_board(csv_path=None, progress_callback=None):
             duplicates_skipped += 1
             continue
         seen.add(key)
+        entry["key"] = key
         # Re-assign sequential rank after deduplication
         entry["rank"] = len(deduped_entries) + 1
         deduped_entries.append(entry)
@@ -152,22 +671,38 @@ def sync_big_board(csv_path=None, progress_callback=None):
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    # Load all non-removed albums for matching
+    # Load all non-removed albums for matching, with their normalized keys
+    refresh_album_match_keys(cursor)
+    collection_version = stamp_collection_version(cursor)
     cursor.execute(
-        "SELECT id, artist, title, release_year, master_year FROM albums WHERE is_removed = 0"
+        """SELECT id, artist, title, artist_key, title_key, release_year, master_year
+           FROM albums WHERE is_removed = 0"""
     )
     albums = cursor.fetchall()
+    # Exact normalized artist+title matches skip fuzzy scoring entirely
+    albums_by_key = {}
+    for album in albums:
+        albums_by_key.setdefault((album["artist_key"], album["title_key"]), []).append(album)
 
     # Snapshot existing entries so we can preserve manual matches and via links.
     # Key by normalized artist+title so we can find the old entry even if the
-    # rank shifted after deduplication.
-    cursor.execute("SELECT rank, artist, title, year, album_id, via_album_id FROM big_board_entries")
+    # rank shifted after deduplication. The import is applied as a diff
+    # against these rows: only inserts, deletes and changed rows are written.
+    cursor.execute(
+        """SELECT id, rank, artist, title, year, album_id, via_album_id
+           FROM big_board_entries ORDER BY rank"""
+    )
     old_by_key = {}
+    stale_ids = []
     for row in cursor.fetchall():
         key = (normalize_for_matching(row["artist"]), normalize_for_matching(row["title"]))
-        # Keep the first (best-ranked) entry per key
-        if key not in old_by_key:
+        # Keep the first (best-ranked) entry per key; later ones (left by
+        # manual edits) are dropped like any entry that's no longer on the board
+        if key in old_by_key:
+            stale_ids.append(row["id"])
+        else:
             old_by_key[key] = dict(row)
+    stale_ids.extend(old["id"] for key, old in old_by_key.items() if key not in seen)
 
     # Load matches the user explicitly rejected ("I don't own this album")
     # so fuzzy matching doesn't reapply the same wrong association on re-sync.
@@ -177,21 +712,44 @@ def sync_big_board(csv_path=None, progress_callback=None):
         key = (row["entry_artist_key"], row["entry_title_key"])
         rejected_by_key.setdefault(key, set()).add(row["album_id"])
 
-    # Clear existing Big Board entries so re-imports are clean
-    cursor.execute("DELETE FROM big_board_entries")
-
     matched = 0
     unmatched = []
     total = len(entries)
     # Track which album_ids have already been claimed by a higher-ranked entry
     # to prevent the same album from matching multiple entries
     claimed_album_ids = set()
+    inserts = []
+    updates = []
 
     if progress_callback:
         progress_callback(f"Matching {total} Big Board entries...", 0, total)
 
+    def resolves_without_fuzzy(entry):
+        """True if the entry should keep its old match or match exactly."""
+        rejected_ids = rejected_by_key.get(entry["key"], set())
+        old = old_by_key.get(entry["key"])
+        if old and old["album_id"] is not None and old["album_id"] not in rejected_ids:
+            return True
+        return all(entry["key"]) and any(
+            album["id"] not in rejected_ids for album in albums_by_key.get(entry["key"], ())
+        )
+
+    # Fuzzy-match every entry that will need it in one batch: new rows and
+    # rows that were unmatched last time (the collection may have changed).
+    # The rest are only matched, one at a time, if a higher-ranked entry
+    # claims their album. Results come from the match cache where the
+    # collection hasn't changed in a way that could affect them.
+    pending = [entry for entry in entries if not resolves_without_fuzzy(entry)]
+    match_cache = AlbumMatchCache(cursor, albums, collection_version)
+    fuzzy_results = {
+        entry["rank"]: result
+        for entry, result in zip(
+            pending, match_cache.best_matches(pending, workers=BIG_BOARD_MATCH_WORKERS)
+        )
+    }
+
     for i, entry in enumerate(entries):
-        key = (normalize_for_matching(entry["artist"]), normalize_for_matching(entry["title"]))
+        key = entry["key"]
         old = old_by_key.get(key)
         rejected_ids = rejected_by_key.get(key, set())
 
@@ -218,8 +776,24 @@ def sync_big_board(csv_path=None, progress_callback=None):
             matched += 1
             need_fuzzy = False
 
+        if need_fuzzy and all(key):
+            exact = next(
+                (
+                    album for album in albums_by_key.get(key, ())
+                    if album["id"] not in claimed_album_ids and album["id"] not in rejected_ids
+                ),
+                None,
+            )
+            if exact:
+                album_id = exact["id"]
+                matched += 1
+                need_fuzzy = False
+
         if need_fuzzy:
-            best_match, score = find_best_match(entry, albums)
+            if entry["rank"] in fuzzy_results:
+                best_match, score = fuzzy_results[entry["rank"]]
+            else:
+                best_match, score = match_cache.best_matches([entry])[0]
             if (
                 best_match
                 and score >= MATCH_THRESHOLD
@@ -246,20 +820,44 @@ def sync_big_board(csv_path=None, progress_callback=None):
         if album_id is not None:
             claimed_album_ids.add(album_id)
 
-        cursor.execute(
-            """INSERT INTO big_board_entries (rank, artist, title, year, album_id, via_album_id)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (entry["rank"], final_artist, final_title, final_year, album_id, via_album_id),
-        )
+        row = (entry["rank"], final_artist, final_title, final_year, album_id)
+        if not old:
+            inserts.append(row + (via_album_id,))
+        elif row != tuple(old[field] for field in ("rank", "artist", "title", "year", "album_id")):
+            updates.append(row + (old["id"], old["rank"]))
 
         if progress_callback and (i + 1) % 50 == 0:
             progress_callback(f"Matched {matched}/{i + 1} entries...", i + 1, total)
 
+    match_cache.prune(seen)
+
+    # Apply the diff. Ranks are unique, so rows that move are parked on a
+    # negative rank first to let them swap places with each other.
+    moved = [update for update in updates if update[0] != update[-1]]
+    cursor.executemany("DELETE FROM big_board_entries WHERE id = ?", [(i,) for i in stale_ids])
+    cursor.executemany(
+        "UPDATE big_board_entries SET rank = -id WHERE id = ?", [(u[5],) for u in moved]
+    )
+    cursor.executemany(
+        """UPDATE big_board_entries SET rank = ?, artist = ?, title = ?, year = ?, album_id = ?
+           WHERE id = ?""",
+        [update[:6] for update in updates],
+    )
+    cursor.executemany(
+        """INSERT INTO big_board_entries (rank, artist, title, year, album_id, via_album_id)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        inserts,
+    )
+
     # Log the sync (no longer need unmatched JSON since entries live in their own table)
     cursor.execute(
         """INSERT INTO sync_log (sync_type, albums_added, albums_updated, unmatched_entries, notes)
            VALUES ('big_board', 0, ?, NULL, ?)""",
-        (matched, f"{len(unmatched)} unmatched entries"),
+        (
+            matched,
+            f"{len(unmatched)} unmatched entries; {len(inserts)} added, "
+            f"{len(stale_ids)} removed, {len(moved)} moved",
+        ),
     )
 
     conn.commit()
@@ -271,6 +869,10 @@ def sync_big_board(csv_path=None, progress_callback=None):
         "unmatched_count": len(unmatched),
         "unmatched": unmatched,
         "duplicates_skipped": duplicates_skipped,
+        "added": len(inserts),
+        "removed": len(stale_ids),
+        "moved": len(moved),
+        "rescored": match_cache.rescored,
     }
 
     dupe_note = f" ({duplicates_skipped} duplicates skipped.)" if duplicates_skipped else ""
@@ -302,6 +904,8 @@ if __name__ == "__main__":
         print(f"  Total entries: {results['total_entries']}")
         print(f"  Matched:       {results['matched']}")
         print(f"  Unmatched:     {results['unmatched_count']}")
+        print(f"  Changes:       {results['added']} added, {results['removed']} removed, "
+              f"{results['moved']} moved")
 
         if results["unmatched"]:
             print(f"\nUnmatched entries:")
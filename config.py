@@ -7,13 +7,29 @@ load_dotenv()
 DISCOGS_TOKEN = os.getenv("DISCOGS_TOKEN")
 DISCOGS_USERNAME = os.getenv("DISCOGS_USERNAME", "mprdolo")
 DISCOGS_USER_AGENT = "RecordSelektah/1.0 +https://github.com/mprdolo/record-selektah"
-DISCOGS_RATE_LIMIT_DELAY = 1.0  # seconds between API calls
+# Point at a local stand-in (see discogs_standin.py) for offline testing
+DISCOGS_API_URL = os.getenv("DISCOGS_API_URL", "https://api.discogs.com")
+DISCOGS_RATE_LIMIT = 60  # requests per minute until Discogs headers say otherwise
+MASTER_YEAR_WORKERS = 4  # concurrent fetchers for the master-year backfill
+MASTER_LOOKUP_RETRY_DAYS = 30  # re-check masters that 404'd or had no year
+MASTER_LOOKUP_ERROR_RETRY_HOURS = 6  # re-check masters whose fetch failed
+
+# Processes used to score Big Board entries (1 = score in-process)
+BIG_BOARD_MATCH_WORKERS = max(1, (os.cpu_count() or 1) - 1)
 
 # Flask
 SECRET_KEY = os.getenv("FLASK_SECRET_KEY", "dev-fallback-key")
 
 # Database
-DATABASE_PATH = os.path.join(os.path.dirname(__file__), "data", "recordselektah.db")
+DATABASE_PATH = os.getenv(
+    "DATABASE_PATH", os.path.join(os.path.dirname(__file__), "data", "recordselektah.db")
+)
+
+# On-disk cache of Discogs master/release responses
+DISCOGS_CACHE_PATH = os.getenv(
+    "DISCOGS_CACHE_PATH", os.path.join(os.path.dirname(__file__), "data", "discogs_cache.db")
+)
+DISCOGS_CACHE_MAX_BYTES = 64 * 1024 * 1024
 
 # Big Board CSV
 BIG_BOARD_CSV_PATH = os.path.join(os.path.dirname(__file__), "data", "big_board.csv")
@@ -12,12 +12,64 @@ def get_db_connection():
     return conn
 
 
+# Recomputes one album's album_listen_summary row from listens
+_SUMMARY_REFRESH_SQL = """
+            DELETE FROM album_listen_summary WHERE album_id = {album_id};
+            INSERT INTO album_listen_summary
+                (album_id, play_count, skip_count, selection_count,
+                 first_played, last_played, last_selected)
+            SELECT album_id,
+                   SUM(did_listen = 1),
+                   SUM(skipped = 1),
+                   COUNT(*),
+                   MIN(CASE WHEN did_listen = 1 THEN selected_epoch END),
+                   MAX(CASE WHEN did_listen = 1 THEN selected_epoch END),
+                   MAX(selected_epoch)
+            FROM listens WHERE album_id = {album_id}
+            GROUP BY album_id;"""
+
+
+def rebuild_listen_summary(conn=None):
+    """Rebuild album_listen_summary from scratch (e.g. for an existing database)."""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM album_listen_summary")
+        cursor.execute(
+            """INSERT INTO album_listen_summary
+                   (album_id, play_count, skip_count, selection_count,
+                    first_played, last_played, last_selected)
+               SELECT album_id,
+                      SUM(did_listen = 1),
+                      SUM(skipped = 1),
+                      COUNT(*),
+                      MIN(CASE WHEN did_listen = 1 THEN selected_epoch END),
+                      MAX(CASE WHEN did_listen = 1 THEN selected_epoch END),
+                      MAX(selected_epoch)
+               FROM listens
+               GROUP BY album_id"""
+        )
+        rebuilt = cursor.rowcount
+        conn.commit()
+        return rebuilt
+    finally:
+        if own_conn:
+            conn.close()
+
+
 def init_db():
     """Create all tables if they don't exist."""
     os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
     conn = get_db_connection()
     cursor = conn.cursor()
 
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'album_listen_summary'"
+    )
+    summary_is_new = cursor.fetchone() is None
+
     cursor.executescript("""
         -- The main collection table
         CREATE TABLE IF NOT EXISTS albums (
@@ -52,6 +104,27 @@ def init_db():
             FOREIGN KEY (album_id) REFERENCES albums(id)
         );
 
+        -- Per-album listen aggregates, maintained by triggers on listens
+        CREATE TABLE IF NOT EXISTS album_listen_summary (
+            album_id INTEGER PRIMARY KEY,
+            play_count INTEGER NOT NULL DEFAULT 0,
+            skip_count INTEGER NOT NULL DEFAULT 0,
+            selection_count INTEGER NOT NULL DEFAULT 0,
+            first_played INTEGER,
+            last_played INTEGER,
+            last_selected INTEGER
+        );
+
+        -- Ledger of Discogs master lookups made by the master-year backfill,
+        -- including 404s and masters with no year, so re-runs can skip them
+        -- until they're due for a retry
+        CREATE TABLE IF NOT EXISTS master_lookups (
+            master_id INTEGER PRIMARY KEY,
+            status INTEGER,
+            year INTEGER,
+            fetched_at INTEGER NOT NULL
+        );
+
         -- Sync log
         CREATE TABLE IF NOT EXISTS sync_log (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -64,6 +137,33 @@ def init_db():
             notes TEXT
         );
 
+        -- Checkpoints for Discogs collection syncs. Each page is committed
+        -- with its run's progress, so a failed sync resumes after the last
+        -- completed page instead of starting over.
+        CREATE TABLE IF NOT EXISTS sync_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sync_type TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            username TEXT,
+            status TEXT NOT NULL DEFAULT 'running',
+            last_page INTEGER NOT NULL DEFAULT 0,
+            total_pages INTEGER,
+            total_items INTEGER,
+            albums_added INTEGER NOT NULL DEFAULT 0,
+            albums_updated INTEGER NOT NULL DEFAULT 0,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        -- Release ids seen so far by an unfinished sync run, for removal
+        -- detection once the pass completes
+        CREATE TABLE IF NOT EXISTS sync_run_releases (
+            run_id INTEGER NOT NULL,
+            discogs_release_id INTEGER NOT NULL,
+            PRIMARY KEY (run_id, discogs_release_id),
+            FOREIGN KEY (run_id) REFERENCES sync_runs(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+
         -- Settings (key-value store for app config)
         CREATE TABLE IF NOT EXISTS settings (
             key TEXT PRIMARY KEY,
@@ -102,7 +202,7 @@ def init_db():
         -- Remembers Big Board entry/album pairings the user explicitly
         -- rejected (via "I don't own this album"), so re-syncs don't
         -- re-apply the same incorrect fuzzy match. Keyed by normalized
-        -- artist/title since entries are deleted and reinserted on sync.
+        -- artist/title so it outlives the entry row itself.
         CREATE TABLE IF NOT EXISTS big_board_rejected_matches (
             entry_artist_key TEXT NOT NULL,
             entry_title_key TEXT NOT NULL,
@@ -110,6 +210,17 @@ def init_db():
             rejected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             PRIMARY KEY (entry_artist_key, entry_title_key, album_id)
         );
+
+        -- Best fuzzy match per normalized Big Board entry, and the
+        -- collection version it was scored against (see bigboard_sync)
+        CREATE TABLE IF NOT EXISTS bigboard_match_cache (
+            entry_artist_key TEXT NOT NULL,
+            entry_title_key TEXT NOT NULL,
+            album_id INTEGER,
+            score REAL NOT NULL,
+            collection_version INTEGER NOT NULL,
+            PRIMARY KEY (entry_artist_key, entry_title_key)
+        ) WITHOUT ROWID;
     """)
 
     # Migrations — add columns that may not exist yet
@@ -117,6 +228,11 @@ def init_db():
         ("albums", "master_id_override", "ALTER TABLE albums ADD COLUMN master_id_override INTEGER"),
         ("albums", "master_year_override", "ALTER TABLE albums ADD COLUMN master_year_override INTEGER"),
         ("big_board_entries", "via_album_id", "ALTER TABLE big_board_entries ADD COLUMN via_album_id INTEGER"),
+        ("listens", "selected_epoch", "ALTER TABLE listens ADD COLUMN selected_epoch INTEGER"),
+        ("albums", "content_hash", "ALTER TABLE albums ADD COLUMN content_hash TEXT"),
+        ("albums", "artist_key", "ALTER TABLE albums ADD COLUMN artist_key TEXT"),
+        ("albums", "title_key", "ALTER TABLE albums ADD COLUMN title_key TEXT"),
+        ("albums", "match_version", "ALTER TABLE albums ADD COLUMN match_version INTEGER"),
     ]
     for table, column, sql in migrations:
         try:
@@ -124,6 +240,75 @@ def init_db():
         except sqlite3.OperationalError:
             cursor.execute(sql)
 
+    # albums.match_version is the collection version an album was last seen
+    # at by the Big Board matcher. New albums start out NULL, and this
+    # trigger resets it when an album is renamed, removed or restored, so
+    # the next Big Board sync knows exactly which albums changed.
+    cursor.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_albums_match_version
+            ON albums(match_version);
+
+        CREATE TRIGGER IF NOT EXISTS trg_albums_match_changed
+        AFTER UPDATE OF artist_key, title_key, is_removed ON albums
+        WHEN NEW.match_version IS NOT NULL
+            AND (OLD.artist_key IS NOT NEW.artist_key
+                 OR OLD.title_key IS NOT NEW.title_key
+                 OR OLD.is_removed IS NOT NEW.is_removed)
+        BEGIN
+            UPDATE albums SET match_version = NULL WHERE id = NEW.id;
+        END;
+    """)
+
+    # Listen times as integer Unix epochs, so the selector and history
+    # queries sort and compare numbers instead of parsing TEXT timestamps.
+    # Backfill older rows, and fill new ones from selected_at on insert.
+    cursor.executescript("""
+        UPDATE listens SET selected_epoch = CAST(strftime('%s', selected_at) AS INTEGER)
+            WHERE selected_epoch IS NULL;
+
+        CREATE INDEX IF NOT EXISTS idx_listens_selected_epoch
+            ON listens(selected_epoch);
+        CREATE INDEX IF NOT EXISTS idx_listens_album_epoch
+            ON listens(album_id, selected_epoch);
+
+        CREATE TRIGGER IF NOT EXISTS trg_listens_selected_epoch
+        AFTER INSERT ON listens
+        WHEN NEW.selected_epoch IS NULL
+        BEGIN
+            UPDATE listens SET selected_epoch = CAST(strftime('%s', NEW.selected_at) AS INTEGER)
+                WHERE id = NEW.id;
+        END;
+    """)
+
+    # Per-album listen summary, kept current by triggers on listens so the
+    # selector, album cards and stats don't re-aggregate the whole table.
+    # Each trigger recomputes just the affected album from its listens rows
+    # (an index range scan), which keeps MIN/MAX correct on updates and
+    # deletes too.
+    refresh = _SUMMARY_REFRESH_SQL
+    cursor.executescript(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_listens_summary_insert
+        AFTER INSERT ON listens
+        BEGIN
+            {refresh.format(album_id="NEW.album_id")}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_listens_summary_update
+        AFTER UPDATE ON listens
+        BEGIN
+            {refresh.format(album_id="OLD.album_id")}
+            {refresh.format(album_id="NEW.album_id")}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_listens_summary_delete
+        AFTER DELETE ON listens
+        BEGIN
+            {refresh.format(album_id="OLD.album_id")}
+        END;
+    """)
+    if summary_is_new:
+        rebuild_listen_summary(conn)
+
     # Migrate existing Big Board data into big_board_entries table
     cursor.execute("SELECT COUNT(*) FROM big_board_entries")
     bb_count = cursor.fetchone()[0]
@@ -176,4 +361,9 @@ def init_db():
 
 
 if __name__ == "__main__":
+    import sys
+
     init_db()
+    if "--rebuild-listen-summary" in sys.argv[1:]:
+        count = rebuild_listen_summary()
+        print(f"Rebuilt listen summary for {count} albums")
@@ -0,0 +1,292 @@
+"""Shared HTTP client for the Discogs API.
+
+All Discogs calls go through one pooled requests.Session and one rate
+limiter, so the collection sync, master-year backfill and album override
+endpoints share keep-alive connections and a single request budget.
+Master and release responses are kept in an on-disk cache.
+"""
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from config import (
+    DISCOGS_TOKEN,
+    DISCOGS_USER_AGENT,
+    DISCOGS_API_URL,
+    DISCOGS_RATE_LIMIT,
+    DISCOGS_CACHE_PATH,
+    DISCOGS_CACHE_MAX_BYTES,
+)
+
+API_BASE_URL = DISCOGS_API_URL
+
+# Retry policy for 429s, 5xx responses and dropped connections
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0  # seconds
+BACKOFF_CAP = 60.0  # seconds
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Cache lifetime per API resource (first path segment). Resources not
+# listed here, like the user's collection, are never cached.
+CACHE_TTLS = {
+    "masters": 30 * 86400,
+    "releases": 30 * 86400,
+}
+
+
+class RateLimiter:
+    """
+    Token bucket sized to the Discogs per-minute request budget.
+
+    Tokens refill continuously at limit/60 per second. Discogs reports the
+    real state of its moving window in the X-Discogs-Ratelimit and
+    X-Discogs-Ratelimit-Remaining headers, and update() snaps the bucket to
+    them, so we run at the allowed rate instead of a fixed delay. That
+    includes requests made by other clients on the same token.
+    """
+
+    def __init__(self, limit=DISCOGS_RATE_LIMIT):
+        self.limit = limit
+        self.tokens = float(limit)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.limit, self.tokens + (now - self.updated) * self.limit / 60)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a request may be sent, then spend a token."""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) * 60 / self.limit
+            time.sleep(wait)
+
+    def update(self, headers):
+        """Sync the bucket with the rate-limit headers of a response."""
+        try:
+            limit = int(headers["X-Discogs-Ratelimit"])
+            remaining = int(headers["X-Discogs-Ratelimit-Remaining"])
+        except (KeyError, ValueError):
+            return
+        with self.lock:
+            self._refill()
+            if limit > 0:
+                self.limit = limit
+            self.tokens = min(self.tokens, float(remaining))
+
+    def drain(self):
+        """Empty the bucket after a 429 so every caller waits for a refill."""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+
+def _backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, honouring a Retry-After header."""
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of Discogs JSON responses, keyed by URL.
+
+    Entries past their TTL are revalidated with If-None-Match /
+    If-Modified-Since when Discogs sent an ETag or Last-Modified. When the
+    total body size exceeds max_bytes, the least recently used entries are
+    evicted.
+    """
+
+    def __init__(self, path=DISCOGS_CACHE_PATH, max_bytes=DISCOGS_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._initialized = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_responses_accessed_at
+                    ON responses(accessed_at);
+            """)
+            self._initialized = True
+        return conn
+
+    def get(self, url):
+        """Return the cached row for url (and mark it used), or None."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM responses WHERE url = ?", (url,)).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url)
+                )
+                conn.commit()
+            return row
+        finally:
+            conn.close()
+
+    def put(self, url, body, etag=None, last_modified=None):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                """INSERT OR REPLACE INTO responses
+                   (url, body, etag, last_modified, size, fetched_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (url, body, etag, last_modified, len(body), now, now),
+            )
+            self._evict(conn)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def refresh(self, url):
+        """Restart an entry's TTL after a 304 Not Modified."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall()
+        stale = []
+        for row in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((row["url"],))
+            total -= row["size"]
+        conn.executemany("DELETE FROM responses WHERE url = ?", stale)
+
+
+def _cache_ttl(url):
+    segments = urlparse(url).path.strip("/").split("/")
+    return CACHE_TTLS.get(segments[0]) if segments else None
+
+
+class DiscogsClient:
+    """Pooled, rate-limited Discogs API client."""
+
+    def __init__(self, token=None, base_url=API_BASE_URL, limiter=None, pool_size=10, cache=None):
+        self.base_url = base_url.rstrip("/")
+        self.limiter = limiter or RateLimiter()
+        self.cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Discogs token={token or DISCOGS_TOKEN}",
+            "User-Agent": DISCOGS_USER_AGENT,
+        })
+
+    def url(self, path):
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(self, path, params=None, timeout=30, headers=None):
+        """
+        GET a Discogs API path (or full URL), retrying 429s, 5xx and
+        connection errors with jittered exponential backoff.
+
+        Raises requests.exceptions.HTTPError for other error statuses or once
+        retries are exhausted, like resp.raise_for_status().
+        """
+        url = self.url(path)
+        for attempt in range(MAX_RETRIES + 1):
+            self.limiter.acquire()
+            try:
+                resp = self.session.get(url, params=params, timeout=timeout, headers=headers)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == MAX_RETRIES:
+                    raise
+                time.sleep(_backoff_delay(attempt))
+                continue
+
+            self.limiter.update(resp.headers)
+            if resp.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+                if resp.status_code == 429:
+                    self.limiter.drain()
+                time.sleep(_backoff_delay(attempt, resp.headers.get("Retry-After")))
+                continue
+
+            resp.raise_for_status()
+            return resp
+
+    def get_json(self, path, params=None, timeout=30):
+        """
+        GET and decode JSON. Master and release lookups are served from the
+        response cache while fresh, and revalidated once their TTL expires.
+        """
+        url = self.url(path)
+        ttl = _cache_ttl(url) if self.cache and not params else None
+        if not ttl:
+            return self.get(url, params=params, timeout=timeout).json()
+
+        entry = self.cache.get(url)
+        if entry and time.time() - entry["fetched_at"] < ttl:
+            return json.loads(entry["body"])
+
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        resp = self.get(url, timeout=timeout, headers=headers)
+        if resp.status_code == 304 and entry:
+            self.cache.refresh(url)
+            return json.loads(entry["body"])
+
+        self.cache.put(url, resp.text, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return resp.json()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide DiscogsClient, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = DiscogsClient(cache=ResponseCache())
+        return _client
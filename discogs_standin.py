@@ -0,0 +1,288 @@
+"""Local stand-in for the parts of the Discogs API Record Selektah uses.
+
+Serves a user's collection (paginated like /users/{u}/collection/folders/0/
+releases), /masters/{id} and /releases/{id} from generated or recorded
+fixtures, so the sync paths can be exercised and benchmarked offline.
+Responses carry X-Discogs-Ratelimit headers from a 60-second moving window,
+and latency, 429s and 5xx errors can be injected.
+
+Point the app at it with DISCOGS_API_URL:
+
+    python discogs_standin.py --releases 10000 --port 8765
+    DISCOGS_API_URL=http://127.0.0.1:8765 DISCOGS_TOKEN=x python discogs_sync.py full
+"""
+import collections
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+GENRES = ["Rock", "Jazz", "Funk / Soul", "Electronic", "Hip Hop", "Reggae", "Blues", "Pop"]
+STYLES = ["Psychedelic Rock", "Hard Bop", "Soul", "House", "Boom Bap", "Roots Reggae", "Indie Rock"]
+FORMATS = ["Vinyl", "CD", "Cassette"]
+
+
+def generate_fixture(releases, seed=1, masterless=0.1):
+    """
+    Build a collection of `releases` items plus the masters and releases
+    they point to. Roughly two releases share each master, and a
+    `masterless` fraction have no master at all.
+    """
+    rnd = random.Random(seed)
+    collection = []
+    masters = {}
+    release_docs = {}
+    for i in range(releases):
+        release_id = 1_000_000 + i
+        master_id = None if rnd.random() < masterless else 500_000 + i // 2
+        year = rnd.choice([0] + list(range(1955, 2025)))
+        artist = f"Artist {rnd.randrange(max(1, releases // 8))}"
+        title = f"Album {i}"
+        genres = rnd.sample(GENRES, rnd.randint(1, 2))
+        info = {
+            "id": release_id,
+            "master_id": master_id or 0,
+            "title": title,
+            "year": year,
+            "artists": [{"name": artist, "id": 10_000 + i % 5000}],
+            "formats": [{"name": rnd.choice(FORMATS), "qty": "1"}],
+            "genres": genres,
+            "styles": rnd.sample(STYLES, rnd.randint(0, 2)),
+            "cover_image": f"https://i.discogs.invalid/R-{release_id}.jpg",
+            "thumb": f"https://i.discogs.invalid/R-{release_id}-150.jpg",
+        }
+        collection.append({
+            "id": release_id,
+            "instance_id": 90_000_000 + i,
+            "date_added": "2020-01-01T00:00:00-08:00",
+            "rating": 0,
+            "basic_information": info,
+        })
+        release_docs[release_id] = {
+            "id": release_id,
+            "title": title,
+            "year": year,
+            "master_id": master_id,
+            "artists": info["artists"],
+            "genres": genres,
+            "images": [{"type": "primary", "uri": info["cover_image"]}],
+        }
+        if master_id and master_id not in masters:
+            masters[master_id] = {
+                "id": master_id,
+                "title": title,
+                "year": rnd.choice([0] + list(range(1950, 2025))),
+                "main_release": release_id,
+                "artists": info["artists"],
+                "images": [{"type": "primary", "uri": f"https://i.discogs.invalid/M-{master_id}.jpg"}],
+            }
+    return {"collection": collection, "masters": masters, "releases": release_docs}
+
+
+def load_fixture(path):
+    """
+    Load a recorded fixture (see record_fixture). Masters and releases the
+    recording doesn't include are derived from the collection items.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    masters = {int(k): v for k, v in data.get("masters", {}).items()}
+    release_docs = {int(k): v for k, v in data.get("releases", {}).items()}
+    for item in data["collection"]:
+        info = item["basic_information"]
+        release_docs.setdefault(info["id"], {
+            "id": info["id"],
+            "title": info.get("title", ""),
+            "year": info.get("year", 0),
+            "master_id": info.get("master_id") or None,
+            "images": [{"uri": info["cover_image"]}] if info.get("cover_image") else [],
+        })
+        if info.get("master_id"):
+            masters.setdefault(info["master_id"], {
+                "id": info["master_id"],
+                "title": info.get("title", ""),
+                "year": info.get("year", 0),
+                "main_release": info["id"],
+                "images": [],
+            })
+    return {"collection": data["collection"], "masters": masters, "releases": release_docs}
+
+
+def record_fixture(path, username=None):
+    """Save the real collection (via the Discogs API) as a fixture file."""
+    from discogs_sync import fetch_collection_page
+
+    collection = []
+    page = 1
+    while True:
+        data = fetch_collection_page(page=page, username=username)
+        collection.extend(data.get("releases", []))
+        if page >= data.get("pagination", {}).get("pages", 1):
+            break
+        page += 1
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"collection": collection}, f)
+    return len(collection)
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle's
+    # algorithm adds ~40ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        segments = url.path.strip("/").split("/")
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if server.latency:
+            time.sleep(server.latency * random.uniform(0.5, 1.5))
+
+        used, over = server.count_request()
+        if over or random.random() < server.throttle_rate:
+            return self._send(429, {"message": "You are making requests too quickly."}, used)
+        if random.random() < server.error_rate:
+            return self._send(random.choice([500, 502, 503]), {"message": "Server error"}, used)
+
+        if len(segments) == 6 and segments[0] == "users" and segments[-1] == "releases":
+            return self._send(200, self._collection_page(params), used)
+        if len(segments) == 2 and segments[0] in ("masters", "releases"):
+            try:
+                doc = server.fixture[segments[0]].get(int(segments[1]))
+            except ValueError:
+                doc = None
+            if doc is None:
+                return self._send(404, {"message": "Release not found."}, used)
+            return self._send(200, doc, used, cacheable=True)
+        return self._send(404, {"message": "The requested resource was not found."}, used)
+
+    def _collection_page(self, params):
+        items = self.server.fixture["collection"]
+        per_page = max(1, min(500, int(params.get("per_page", 50))))
+        page = max(1, int(params.get("page", 1)))
+        pages = max(1, -(-len(items) // per_page))
+        # Newest additions first, matching sort=added&sort_order=desc
+        start = len(items) - page * per_page
+        chunk = items[max(0, start):max(0, start + per_page)][::-1]
+        return {
+            "pagination": {
+                "page": page,
+                "pages": pages,
+                "per_page": per_page,
+                "items": len(items),
+                "urls": {},
+            },
+            "releases": chunk,
+        }
+
+    def _send(self, status, payload, used, cacheable=False):
+        body = json.dumps(payload).encode("utf-8")
+        etag = f'"{hashlib.md5(body).hexdigest()}"' if cacheable else None
+        if etag and self.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+
+        limit = self.server.rate_limit
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Discogs-Ratelimit", str(limit))
+        self.send_header("X-Discogs-Ratelimit-Used", str(min(used, limit)))
+        self.send_header("X-Discogs-Ratelimit-Remaining", str(max(0, limit - used)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandinServer(ThreadingHTTPServer):
+    """
+    Threaded stand-in server.
+
+    latency      — mean seconds added to every response (jittered ±50%)
+    rate_limit   — requests per moving 60-second window before 429s
+    error_rate   — fraction of requests answered with a random 5xx
+    throttle_rate — fraction of requests answered with a spurious 429
+    """
+
+    daemon_threads = True
+
+    def __init__(self, fixture, host="127.0.0.1", port=0, latency=0.0, rate_limit=60,
+                 error_rate=0.0, throttle_rate=0.0, verbose=False):
+        super().__init__((host, port), StandinHandler)
+        self.fixture = fixture
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.verbose = verbose
+        self.window = collections.deque()
+        self.window_lock = threading.Lock()
+        self.request_count = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self):
+        """Record a request; return (used in window, whether it's over the limit)."""
+        now = time.monotonic()
+        with self.window_lock:
+            self.request_count += 1
+            while self.window and now - self.window[0] >= 60:
+                self.window.popleft()
+            if len(self.window) >= self.rate_limit:
+                return len(self.window), True
+            self.window.append(now)
+            return len(self.window), False
+
+    def start(self):
+        """Serve from a daemon thread; returns self for chaining."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local Discogs API stand-in")
+    parser.add_argument("--releases", type=int, default=1000, help="generated collection size")
+    parser.add_argument("--fixture", help="serve a recorded fixture file instead")
+    parser.add_argument("--record", metavar="PATH", help="record your real collection to PATH and exit")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="mean seconds per response")
+    parser.add_argument("--rate-limit", type=int, default=60, help="requests per minute")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 5xx responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of spurious 429s")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    if args.record:
+        count = record_fixture(args.record)
+        print(f"Recorded {count} releases to {args.record}")
+        raise SystemExit(0)
+
+    fixture = load_fixture(args.fixture) if args.fixture else generate_fixture(args.releases, args.seed)
+    server = StandinServer(
+        fixture, args.host, args.port, latency=args.latency, rate_limit=args.rate_limit,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate, verbose=args.verbose,
+    )
+    print(
+        f"Serving {len(fixture['collection'])} releases and {len(fixture['masters'])} masters "
+        f"at {server.url} (Ctrl+C to stop)"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
@@ -1,14 +1,28 @@
+import csv
+import hashlib
 import json
-import time
+import queue
+import threading
 import requests
 from db import get_db_connection
+from discogs_client import get_client
+from bigboard_sync import normalize_for_matching
 from config import (
     DISCOGS_TOKEN,
     DISCOGS_USERNAME,
-    DISCOGS_USER_AGENT,
-    DISCOGS_RATE_LIMIT_DELAY,
 )
 
+SYNC_MODES = ("auto", "full", "incremental")
+
+# Run a full (removal-detecting) pass at least this often in "auto" mode
+FULL_SYNC_INTERVAL_DAYS = 7
+
+# Resume an interrupted sync only if its last checkpoint is this recent
+SYNC_RESUME_MAX_AGE_HOURS = 24
+
+# Pages the fetch thread may get ahead of the database writer
+PIPELINE_DEPTH = 2
+
 def _get_active_username():
     """Return username from DB settings if set, otherwise fall back to config."""
     try:
@@ -26,24 +40,15 @@ def _get_active_username():
     return DISCOGS_USERNAME
 
 
-def _make_headers():
-    return {
-        "Authorization": f"Discogs token={DISCOGS_TOKEN}",
-        "User-Agent": DISCOGS_USER_AGENT,
-    }
-
-
 def _make_collection_url(username=None):
     u = username or _get_active_username()
-    return f"https://api.discogs.com/users/{u}/collection/folders/0/releases"
+    return f"/users/{u}/collection/folders/0/releases"
 
 
 def fetch_collection_page(page=1, per_page=100, username=None):
     """Fetch a single page of the user's Discogs collection."""
     params = {"page": page, "per_page": per_page, "sort": "added", "sort_order": "desc"}
-    resp = requests.get(_make_collection_url(username), headers=_make_headers(), params=params, timeout=30)
-    resp.raise_for_status()
-    return resp.json()
+    return get_client().get_json(_make_collection_url(username), params=params)
 
 
 def parse_release(item):
@@ -55,11 +60,13 @@ def parse_release(item):
     formats = info.get("formats", [])
     fmt = formats[0]["name"] if formats else None
 
+    title = info.get("title", "")
+
     return {
         "discogs_release_id": info["id"],
         "discogs_master_id": info.get("master_id") or None,
         "artist": artist,
-        "title": info.get("title", ""),
+        "title": title,
         "release_year": info.get("year") or None,
         "cover_image_url": info.get("cover_image") or info.get("thumb") or None,
         "genres": json.dumps(info.get("genres", [])),
@@ -71,163 +78,443 @@ def parse_release(item):
             if info.get("master_id")
             else None
         ),
+        # Normalized keys for Big Board matching (not part of the content hash)
+        "artist_key": normalize_for_matching(artist),
+        "title_key": normalize_for_matching(title),
     }
 
 
-def sync_collection(progress_callback=None):
+# Fields of a parsed release that go into its content hash
+HASHED_FIELDS = (
+    "discogs_release_id", "discogs_master_id", "artist", "title",
+    "release_year", "cover_image_url", "genres", "styles", "format",
+    "discogs_url", "master_url",
+)
+
+
+def release_hash(release):
+    """Hash of a parsed release's fields, to skip albums that haven't changed."""
+    payload = json.dumps([release[field] for field in HASHED_FIELDS])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# Insert a parsed release, or refresh an existing album's Discogs metadata
+# while preserving user data. When the user has set a master override,
+# discogs_master_id, master_url and cover_image_url are left alone.
+# Albums whose content hash matches and that aren't marked removed are
+# left untouched, so updated_at only moves when something changed.
+UPSERT_ALBUM_SQL = """
+    INSERT INTO albums
+        (discogs_release_id, discogs_master_id, artist, title,
+         release_year, cover_image_url, genres, styles, format,
+         discogs_url, master_url, content_hash, artist_key, title_key)
+    VALUES
+        (:discogs_release_id, :discogs_master_id, :artist, :title,
+         :release_year, :cover_image_url, :genres, :styles, :format,
+         :discogs_url, :master_url, :content_hash, :artist_key, :title_key)
+    ON CONFLICT(discogs_release_id) DO UPDATE SET
+        discogs_master_id = CASE WHEN albums.master_id_override
+            THEN albums.discogs_master_id ELSE excluded.discogs_master_id END,
+        artist = excluded.artist,
+        title = excluded.title,
+        artist_key = excluded.artist_key,
+        title_key = excluded.title_key,
+        release_year = excluded.release_year,
+        cover_image_url = CASE WHEN albums.master_id_override
+            THEN albums.cover_image_url ELSE excluded.cover_image_url END,
+        genres = excluded.genres,
+        styles = excluded.styles,
+        format = excluded.format,
+        discogs_url = excluded.discogs_url,
+        master_url = CASE WHEN albums.master_id_override
+            THEN albums.master_url ELSE excluded.master_url END,
+        content_hash = excluded.content_hash,
+        is_removed = 0,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE albums.content_hash IS NOT excluded.content_hash
+       OR albums.is_removed = 1
+"""
+
+
+# Same insert as UPSERT_ALBUM_SQL, for rows from a collection CSV export.
+# The export has no master, cover, genre or style data, so existing albums
+# keep whatever an API sync stored and only fill a missing year; albums
+# with nothing to fill are left untouched.
+UPSERT_ALBUM_FROM_CSV_SQL = """
+    INSERT INTO albums
+        (discogs_release_id, discogs_master_id, artist, title,
+         release_year, cover_image_url, genres, styles, format,
+         discogs_url, master_url, artist_key, title_key)
+    VALUES
+        (:discogs_release_id, :discogs_master_id, :artist, :title,
+         :release_year, :cover_image_url, :genres, :styles, :format,
+         :discogs_url, :master_url, :artist_key, :title_key)
+    ON CONFLICT(discogs_release_id) DO UPDATE SET
+        release_year = COALESCE(albums.release_year, excluded.release_year),
+        is_removed = 0,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE (albums.release_year IS NULL AND excluded.release_year IS NOT NULL)
+       OR albums.is_removed = 1
+"""
+
+
+def _resolve_sync_mode(cursor, mode):
+    """Turn "auto" into "full" when a reconcile is due, else "incremental"."""
+    if mode != "auto":
+        return mode
+    # Syncs logged before incremental mode existed (notes NULL) were full
+    cursor.execute(
+        """SELECT 1 FROM sync_log
+           WHERE sync_type = 'discogs' AND (notes IS NULL OR notes = 'full')
+             AND synced_at >= datetime('now', ?)
+           LIMIT 1""",
+        (f"-{FULL_SYNC_INTERVAL_DAYS} days",),
+    )
+    return "incremental" if cursor.fetchone() else "full"
+
+
+def parse_csv_release(row):
+    """
+    Map a row of a Discogs collection CSV export onto parse_release()'s
+    fields. Fields the export doesn't carry (master, cover, genres, styles)
+    are None; the next full API sync fills them in. So is format: the
+    export lists descriptors ("LP, Album") rather than the format names the
+    API stores ("Vinyl").
+    """
+    release_id = int(row["release_id"])
+    year = (row.get("Released") or "").strip()
+    artist = (row.get("Artist") or "").strip() or "Unknown"
+    title = (row.get("Title") or "").strip()
+
+    return {
+        "discogs_release_id": release_id,
+        "discogs_master_id": None,
+        "artist": artist,
+        "title": title,
+        "release_year": int(year) if year.isdigit() and int(year) else None,
+        "cover_image_url": None,
+        "genres": None,
+        "styles": None,
+        "format": None,
+        "discogs_url": f"https://www.discogs.com/release/{release_id}",
+        "master_url": None,
+        "artist_key": normalize_for_matching(artist),
+        "title_key": normalize_for_matching(title),
+    }
+
+
+def import_collection_csv(csv_path, progress_callback=None, batch_size=500):
+    """
+    Load a Discogs collection CSV export (Collection > Export on discogs.com)
+    into the database without any API calls. Meant for the initial load of a
+    large collection; later API syncs pick up additions and fill in master,
+    cover and genre data.
+
+    Rows are streamed and written in batches with one executemany each.
+    Returns a dict with import results.
     """
-    Sync the full Discogs collection into the database.
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    # Every album we hold, with whether it lacks a year or is marked
+    # removed: the only things an import changes on an existing album
+    cursor.execute(
+        "SELECT discogs_release_id, release_year IS NULL, is_removed FROM albums"
+    )
+    known = {row[0]: (bool(row[1]), bool(row[2])) for row in cursor.fetchall()}
+
+    added = 0
+    updated = 0
+    skipped = 0
+    imported = 0
+    batch = []
+
+    if progress_callback:
+        progress_callback("Importing collection CSV...", 0, 0)
+
+    try:
+        with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                try:
+                    release = parse_csv_release(row)
+                except (KeyError, TypeError, ValueError):
+                    skipped += 1
+                    continue
+
+                imported += 1
+                release_id = release["discogs_release_id"]
+                if release_id not in known:
+                    added += 1
+                else:
+                    no_year, is_removed = known[release_id]
+                    if not is_removed and not (no_year and release["release_year"]):
+                        continue
+                    updated += 1
+                known[release_id] = (release["release_year"] is None, False)
+                batch.append(release)
+
+                if len(batch) >= batch_size:
+                    cursor.executemany(UPSERT_ALBUM_FROM_CSV_SQL, batch)
+                    batch.clear()
+                    if progress_callback:
+                        progress_callback(f"Imported {imported} releases...", imported, 0)
+
+        if batch:
+            cursor.executemany(UPSERT_ALBUM_FROM_CSV_SQL, batch)
+
+        cursor.execute(
+            """INSERT INTO sync_log (sync_type, albums_added, albums_updated, albums_removed, notes)
+               VALUES ('discogs_csv', ?, ?, 0, ?)""",
+            (added, updated, f"{skipped} rows skipped"),
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    results = {"added": added, "updated": updated, "skipped": skipped}
+
+    if progress_callback:
+        progress_callback(
+            f"Done! Added {added}, updated {updated}, skipped {skipped} rows.",
+            imported,
+            imported,
+        )
+
+    return results
+
+
+class _PageFetcher:
+    """
+    Background thread that downloads and parses collection pages ahead of
+    the database writer, starting at start_page.
+
+    Pages go through a bounded queue, so the fetcher blocks once it is
+    PIPELINE_DEPTH pages ahead. A fetch error is handed to the writer and
+    re-raised from get().
+    """
+
+    def __init__(self, username, start_page, depth=PIPELINE_DEPTH):
+        self.queue = queue.Queue(maxsize=depth)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(
+            target=self._run, args=(username, start_page), daemon=True
+        )
+        self.thread.start()
+
+    def _run(self, username, page):
+        while not self.stop_event.is_set():
+            try:
+                data = fetch_collection_page(page=page, username=username)
+                parsed = [parse_release(item) for item in data.get("releases", [])]
+                for release in parsed:
+                    release["content_hash"] = release_hash(release)
+            except Exception as e:
+                self._put((page, None, None, e))
+                return
+
+            pagination = data.get("pagination", {})
+            if not self._put((page, pagination, parsed, None)):
+                return
+            if not parsed or page >= pagination.get("pages", 1):
+                return
+            page += 1
+
+    def _put(self, item):
+        """Queue an item, giving up if the writer has stopped us."""
+        while not self.stop_event.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(self):
+        """Return the next (page, pagination, parsed releases)."""
+        page, pagination, parsed, error = self.queue.get()
+        if error is not None:
+            raise error
+        return page, pagination, parsed
+
+    def close(self):
+        self.stop_event.set()
+        self.thread.join()
+
+
+def _start_or_resume_run(cursor, mode, username):
+    """
+    Return (run, resumed) for this sync. An unfinished run for the same
+    user is resumed if it's recent and, unless mode is "auto", of the
+    requested mode; otherwise a new run is started.
+    """
+    cursor.execute(
+        """SELECT * FROM sync_runs
+           WHERE sync_type = 'discogs' AND status = 'running'
+             AND username IS ?
+             AND updated_at >= datetime('now', ?)
+           ORDER BY id DESC LIMIT 1""",
+        (username, f"-{SYNC_RESUME_MAX_AGE_HOURS} hours"),
+    )
+    run = cursor.fetchone()
+    if run and mode in ("auto", run["mode"]):
+        return run, True
+
+    # Abandon older runs; their release lists are no longer needed
+    cursor.execute(
+        "UPDATE sync_runs SET status = 'abandoned' WHERE sync_type = 'discogs' AND status = 'running'"
+    )
+    cursor.execute(
+        "DELETE FROM sync_run_releases WHERE run_id NOT IN "
+        "(SELECT id FROM sync_runs WHERE status = 'running')"
+    )
+    cursor.execute(
+        "INSERT INTO sync_runs (sync_type, mode, username) VALUES ('discogs', ?, ?)",
+        (_resolve_sync_mode(cursor, mode), username),
+    )
+    cursor.execute("SELECT * FROM sync_runs WHERE id = ?", (cursor.lastrowid,))
+    return cursor.fetchone(), False
+
+
+def sync_collection(progress_callback=None, mode="auto"):
+    """
+    Sync the Discogs collection into the database.
+
+    mode:
+      "full"        — walk every page and mark albums missing from Discogs
+                      as removed.
+      "incremental" — pages are sorted newest-added first, so stop after the
+                      first page made up entirely of releases we already
+                      have. Picks up additions quickly but can't detect
+                      removals.
+      "auto"        — full if no full reconcile ran in the last
+                      FULL_SYNC_INTERVAL_DAYS days, otherwise incremental.
+
+    Each page is committed along with a checkpoint in sync_runs. If a sync
+    fails partway, the next call resumes after the last completed page
+    (see _start_or_resume_run). Removals are only marked once a full pass
+    has seen every page.
+
+    Albums are only rewritten when their content hash shows the Discogs
+    data changed, and "updated" in the results counts just those.
 
     progress_callback(message, current, total) is called to report progress.
     Returns a dict with sync results.
     """
     if not DISCOGS_TOKEN:
         raise ValueError("DISCOGS_TOKEN is not set. Check your .env file.")
+    if mode not in SYNC_MODES:
+        raise ValueError(f"Unknown sync mode: {mode}")
 
     username = _get_active_username()
 
     conn = get_db_connection()
     cursor = conn.cursor()
-
+    run, resumed = _start_or_resume_run(cursor, mode, username)
+    conn.commit()
+    run_id = run["id"]
+    mode = run["mode"]
+
+    # Every release we hold, removed or not, with its content hash, to tell
+    # inserts from real changes and unchanged albums
+    cursor.execute("SELECT discogs_release_id, content_hash, is_removed FROM albums")
+    known = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
     # Track what's currently in the DB so we can detect removals
-    cursor.execute("SELECT discogs_release_id FROM albums WHERE is_removed = 0")
-    existing_ids = set(row[0] for row in cursor.fetchall())
-
-    fetched_ids = set()
-    added = 0
-    updated = 0
+    existing_ids = set(rid for rid, (_, is_removed) in known.items() if not is_removed)
+
+    cursor.execute(
+        "SELECT discogs_release_id FROM sync_run_releases WHERE run_id = ?", (run_id,)
+    )
+    fetched_ids = set(row[0] for row in cursor.fetchall())
+    added = run["albums_added"]
+    updated = run["albums_updated"]
     removed = 0
-    page = 1
-    total_pages = None
+    page = run["last_page"] + 1
+    total_pages = run["total_pages"]
+
+    # The fetcher downloads and parses pages while this thread writes them
+    fetcher = _PageFetcher(username, page)
 
     try:
         while True:
             if progress_callback:
+                note = " (resumed)" if resumed else ""
                 if total_pages:
                     progress_callback(
-                        f"Fetching page {page} of {total_pages}...", page, total_pages
+                        f"Fetching page {page} of {total_pages}{note}...", page, total_pages
                     )
                 else:
-                    progress_callback(f"Fetching page {page}...", page, 0)
+                    progress_callback(f"Fetching page {page}{note}...", page, 0)
 
-            data = fetch_collection_page(page=page, username=username)
+            page, pagination, parsed = fetcher.get()
 
-            pagination = data.get("pagination", {})
             total_pages = pagination.get("pages", 1)
-
-            releases = data.get("releases", [])
-            if not releases:
+            total_items = pagination.get("items")
+
+            if resumed and page > 1 and total_items != run["total_items"]:
+                # The collection changed since the checkpoint, so pages have
+                # shifted and releases could slip past the pages already
+                # done. Start the pass again from the top. The counts from
+                # the earlier attempt stay: its writes are committed, so
+                # the rerun sees those albums as unchanged.
+                fetched_ids.clear()
+                cursor.execute("DELETE FROM sync_run_releases WHERE run_id = ?", (run_id,))
+                resumed = False
+                page = 1
+                fetcher.close()
+                fetcher = _PageFetcher(username, page)
+                continue
+            resumed = False
+
+            if not parsed:
                 break
 
-            for item in releases:
-                release = parse_release(item)
-                fetched_ids.add(release["discogs_release_id"])
-
-                # Check if this release already exists
-                cursor.execute(
-                    "SELECT id, is_removed FROM albums WHERE discogs_release_id = ?",
-                    (release["discogs_release_id"],),
-                )
-                row = cursor.fetchone()
-
-                if row is None:
-                    # New album — insert
-                    cursor.execute(
-                        """INSERT INTO albums
-                        (discogs_release_id, discogs_master_id, artist, title,
-                         release_year, cover_image_url, genres, styles, format,
-                         discogs_url, master_url)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                        (
-                            release["discogs_release_id"],
-                            release["discogs_master_id"],
-                            release["artist"],
-                            release["title"],
-                            release["release_year"],
-                            release["cover_image_url"],
-                            release["genres"],
-                            release["styles"],
-                            release["format"],
-                            release["discogs_url"],
-                            release["master_url"],
-                        ),
-                    )
+            changed = []
+            page_all_known = True
+            for release in parsed:
+                release_id = release["discogs_release_id"]
+                fetched_ids.add(release_id)
+                if release_id not in existing_ids:
+                    page_all_known = False
+                if release_id not in known:
                     added += 1
-                else:
-                    # Existing album — update metadata, preserve user data
-                    # Check if user has a manual master override
-                    cursor.execute(
-                        "SELECT master_id_override FROM albums WHERE discogs_release_id = ?",
-                        (release["discogs_release_id"],),
-                    )
-                    override_row = cursor.fetchone()
-                    has_override = override_row and override_row["master_id_override"]
-
-                    if has_override:
-                        # Skip master_id, master_url, AND cover_image_url — user overrode master
-                        cursor.execute(
-                            """UPDATE albums SET
-                                artist = ?,
-                                title = ?,
-                                release_year = ?,
-                                genres = ?,
-                                styles = ?,
-                                format = ?,
-                                discogs_url = ?,
-                                is_removed = 0,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE discogs_release_id = ?""",
-                            (
-                                release["artist"],
-                                release["title"],
-                                release["release_year"],
-                                release["genres"],
-                                release["styles"],
-                                release["format"],
-                                release["discogs_url"],
-                                release["discogs_release_id"],
-                            ),
-                        )
-                    else:
-                        cursor.execute(
-                            """UPDATE albums SET
-                                discogs_master_id = ?,
-                                artist = ?,
-                                title = ?,
-                                release_year = ?,
-                                cover_image_url = ?,
-                                genres = ?,
-                                styles = ?,
-                                format = ?,
-                                discogs_url = ?,
-                                master_url = ?,
-                                is_removed = 0,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE discogs_release_id = ?""",
-                            (
-                                release["discogs_master_id"],
-                                release["artist"],
-                                release["title"],
-                                release["release_year"],
-                                release["cover_image_url"],
-                                release["genres"],
-                                release["styles"],
-                                release["format"],
-                                release["discogs_url"],
-                                release["master_url"],
-                                release["discogs_release_id"],
-                            ),
-                        )
+                elif known[release_id] != (release["content_hash"], 0):
                     updated += 1
+                else:
+                    continue
+                known[release_id] = (release["content_hash"], 0)
+                changed.append(release)
+
+            if changed:
+                cursor.executemany(UPSERT_ALBUM_SQL, changed)
+            cursor.executemany(
+                "INSERT OR IGNORE INTO sync_run_releases (run_id, discogs_release_id) VALUES (?, ?)",
+                [(run_id, r["discogs_release_id"]) for r in parsed],
+            )
+            cursor.execute(
+                """UPDATE sync_runs
+                   SET last_page = ?, total_pages = ?, total_items = ?,
+                       albums_added = ?, albums_updated = ?,
+                       updated_at = CURRENT_TIMESTAMP
+                   WHERE id = ?""",
+                (page, total_pages, total_items, added, updated, run_id),
+            )
+            conn.commit()
 
             if page >= total_pages:
                 break
 
+            if mode == "incremental" and page_all_known:
+                # Everything older than this page is already in the DB
+                break
+
             page += 1
-            time.sleep(DISCOGS_RATE_LIMIT_DELAY)
 
-        # Mark albums removed from Discogs (but don't delete history)
-        removed_ids = existing_ids - fetched_ids
+        # Mark albums removed from Discogs (but don't delete history).
+        # Only a full pass has seen the whole collection.
+        removed_ids = existing_ids - fetched_ids if mode == "full" else set()
         if removed_ids:
             placeholders = ",".join("?" for _ in removed_ids)
             cursor.execute(
@@ -237,31 +524,39 @@ def sync_collection(progress_callback=None):
             )
             removed = len(removed_ids)
 
-        # Log the sync
+        # Log the sync and close out the run
+        cursor.execute(
+            """INSERT INTO sync_log (sync_type, albums_added, albums_updated, albums_removed, notes)
+               VALUES ('discogs', ?, ?, ?, ?)""",
+            (added, updated, removed, mode),
+        )
         cursor.execute(
-            """INSERT INTO sync_log (sync_type, albums_added, albums_updated, albums_removed)
-               VALUES ('discogs', ?, ?, ?)""",
-            (added, updated, removed),
+            "UPDATE sync_runs SET status = 'complete', updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (run_id,),
         )
+        cursor.execute("DELETE FROM sync_run_releases WHERE run_id = ?", (run_id,))
 
         conn.commit()
 
         results = {
             "added": added,
             "updated": updated,
+            "unchanged": max(0, len(fetched_ids) - added - updated),
             "removed": removed,
             "total_fetched": len(fetched_ids),
+            "mode": mode,
         }
 
         if progress_callback:
             progress_callback(
                 f"Done! Added {added}, updated {updated}, removed {removed}.",
-                total_pages,
-                total_pages,
+                page,
+                page,
             )
 
         return results
 
+    # Pages committed before the failure stay, along with the checkpoint
     except requests.exceptions.HTTPError as e:
         conn.rollback()
         raise RuntimeError(f"Discogs API error: {e.response.status_code} — {e.response.text}")
@@ -274,20 +569,38 @@ def sync_collection(progress_callback=None):
         conn.rollback()
         raise
     finally:
+        fetcher.close()
         conn.close()
 
 
 if __name__ == "__main__":
+    import sys
+
     def print_progress(msg, current, total):
         print(msg)
 
-    print("Starting Discogs collection sync...")
+    if len(sys.argv) > 2 and sys.argv[1] == "--csv":
+        print(f"Importing collection from {sys.argv[2]}...")
+        try:
+            results = import_collection_csv(sys.argv[2], progress_callback=print_progress)
+            print(f"\nImport complete!")
+            print(f"  Added:   {results['added']}")
+            print(f"  Updated: {results['updated']}")
+            print(f"  Skipped: {results['skipped']}")
+        except Exception as e:
+            print(f"\nImport failed: {e}")
+        sys.exit(0)
+
+    mode = sys.argv[1] if len(sys.argv) > 1 else "auto"
+    print(f"Starting Discogs collection sync ({mode})...")
     try:
-        results = sync_collection(progress_callback=print_progress)
+        results = sync_collection(progress_callback=print_progress, mode=mode)
         print(f"\nSync complete!")
         print(f"  Added:   {results['added']}")
         print(f"  Updated: {results['updated']}")
+        print(f"  Unchanged: {results['unchanged']}")
         print(f"  Removed: {results['removed']}")
         print(f"  Total:   {results['total_fetched']}")
+        print(f"  Mode:    {results['mode']}")
     except Exception as e:
         print(f"\nSync failed: {e}")
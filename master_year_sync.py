@@ -1,137 +1,340 @@
+import gzip
+import threading
 import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 import requests
 from db import get_db_connection
-from config import DISCOGS_TOKEN, DISCOGS_USER_AGENT, DISCOGS_RATE_LIMIT_DELAY
-
-HEADERS = {
-    "Authorization": f"Discogs token={DISCOGS_TOKEN}",
-    "User-Agent": DISCOGS_USER_AGENT,
-}
+from discogs_client import get_client
+from config import (
+    MASTER_YEAR_WORKERS,
+    MASTER_LOOKUP_RETRY_DAYS,
+    MASTER_LOOKUP_ERROR_RETRY_HOURS,
+)
 
 
 def fetch_master_year(master_id):
     """Fetch the original release year from a Discogs master release."""
-    url = f"https://api.discogs.com/masters/{master_id}"
-    resp = requests.get(url, headers=HEADERS, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
+    data = get_client().get_json(f"/masters/{master_id}")
     return data.get("year") or None
 
 
-def sync_master_years(progress_callback=None, batch_size=0):
+# Years are written in batches of this many masters
+WRITE_BATCH_SIZE = 50
+
+# Fill one master's year into every pending album that shares it
+SET_MASTER_YEAR_SQL = """
+    UPDATE albums SET master_year = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE discogs_master_id = ?
+      AND master_year IS NULL
+      AND is_removed = 0
+"""
+
+RECORD_LOOKUP_SQL = """
+    INSERT OR REPLACE INTO master_lookups (master_id, status, year, fetched_at)
+    VALUES (?, ?, ?, ?)
+"""
+
+
+def _fetch_one(master_id, stop_event):
+    """
+    Worker task: fetch one master's year.
+
+    Returns (master_id, year, http_status, outcome) where outcome is "ok",
+    "missing" (404), "error" or "skipped" (the run was stopped before this
+    task started). Connection errors propagate so the whole run can stop.
+    """
+    if stop_event.is_set():
+        return master_id, None, None, "skipped"
+    try:
+        return master_id, fetch_master_year(master_id), 200, "ok"
+    except requests.exceptions.HTTPError as e:
+        status = e.response.status_code
+        # Anything but a 404 is an error, including 429s that outlasted
+        # the client's backoff
+        return master_id, None, status, "missing" if status == 404 else "error"
+    except requests.exceptions.ConnectionError:
+        raise
+    except Exception:
+        return master_id, None, None, "error"
+
+
+def sync_master_years(progress_callback=None, batch_size=0, workers=MASTER_YEAR_WORKERS,
+                      cancel_event=None):
     """
     Fetch master release years for albums that don't have one yet.
 
-    batch_size: if > 0, stop after this many fetches (useful for incremental runs).
+    Albums are grouped by master, so several pressings of the same album
+    cost a single /masters request. Up to `workers` threads fetch
+    concurrently; they share the Discogs client's rate limiter, so together
+    they stay within one request budget. Results are handed back to this
+    thread, the only one that writes, which applies them in batched UPDATEs.
+
+    Every lookup is recorded in master_lookups. Masters that 404'd or had
+    no year are skipped for MASTER_LOOKUP_RETRY_DAYS, failed fetches for
+    MASTER_LOOKUP_ERROR_RETRY_HOURS, so re-runs only touch new work.
+
+    batch_size: if > 0, stop after this many masters (useful for incremental runs).
                 if 0, fetch all.
-    progress_callback(message, current, total) reports progress.
+    progress_callback(message, current, total) reports progress, counted in masters.
+    cancel_event: optional threading.Event; once set, no new fetches start and
+                  the results gathered so far are saved.
     Returns dict with results.
     """
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    # Find albums with a master_id but no master_year
+    # Albums added since their master was looked up can take the year
+    # straight from the ledger
     cursor.execute(
-        """SELECT id, discogs_master_id FROM albums
-           WHERE discogs_master_id IS NOT NULL
-             AND master_year IS NULL
+        """UPDATE albums SET master_year = (
+               SELECT ml.year FROM master_lookups ml WHERE ml.master_id = albums.discogs_master_id
+           ), updated_at = CURRENT_TIMESTAMP
+           WHERE master_year IS NULL
              AND is_removed = 0
-           ORDER BY id"""
+             AND discogs_master_id IN (SELECT master_id FROM master_lookups WHERE year IS NOT NULL)"""
     )
-    albums = cursor.fetchall()
-    total = len(albums)
+    from_ledger = cursor.rowcount
+    conn.commit()
+
+    # Find distinct masters of albums that have a master_id but no master_year,
+    # leaving out masters that recently 404'd, had no year, or failed
+    now = int(time.time())
+    cursor.execute(
+        """SELECT a.discogs_master_id, COUNT(*) AS album_count
+           FROM albums a
+           LEFT JOIN master_lookups ml ON ml.master_id = a.discogs_master_id
+           WHERE a.discogs_master_id IS NOT NULL
+             AND a.master_year IS NULL
+             AND a.is_removed = 0
+             AND (
+                 ml.master_id IS NULL
+                 OR (ml.status IN (200, 404) AND ml.fetched_at < ?)
+                 OR (COALESCE(ml.status, 0) NOT IN (200, 404) AND ml.fetched_at < ?)
+             )
+           GROUP BY a.discogs_master_id
+           ORDER BY MIN(a.id)""",
+        (
+            now - MASTER_LOOKUP_RETRY_DAYS * 86400,
+            now - MASTER_LOOKUP_ERROR_RETRY_HOURS * 3600,
+        ),
+    )
+    masters = cursor.fetchall()
+    total = len(masters)
 
     if batch_size > 0:
-        albums = albums[:batch_size]
+        masters = masters[:batch_size]
 
-    to_fetch = len(albums)
+    to_fetch = len(masters)
     fetched = 0
     errors = 0
+    albums_updated = from_ledger
+    pending_years = []
+    pending_lookups = []
+    stop_event = threading.Event()
+    cancel_event = cancel_event or threading.Event()
+
+    def flush():
+        nonlocal albums_updated
+        if pending_lookups:
+            cursor.executemany(RECORD_LOOKUP_SQL, pending_lookups)
+            pending_lookups.clear()
+        if pending_years:
+            cursor.executemany(SET_MASTER_YEAR_SQL, pending_years)
+            albums_updated += cursor.rowcount
+            pending_years.clear()
+        conn.commit()
 
     if progress_callback:
         progress_callback(
-            f"Fetching master years for {to_fetch} of {total} albums...", 0, to_fetch
+            f"Fetching master years for {to_fetch} of {total} masters...", 0, to_fetch
         )
 
+    master_ids = iter(row["discogs_master_id"] for row in masters)
+    in_flight = set()
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+
+    def submit_next():
+        # Keep the queue short so cancellation takes effect quickly
+        master_id = next(master_ids, None)
+        if master_id is not None:
+            in_flight.add(pool.submit(_fetch_one, master_id, stop_event))
+
     try:
-        for row in albums:
-            album_id = row["id"]
-            master_id = row["discogs_master_id"]
+        for _ in range(max(1, workers) * 2):
+            submit_next()
 
-            try:
-                year = fetch_master_year(master_id)
-                if year:
-                    cursor.execute(
-                        """UPDATE albums SET master_year = ?, updated_at = CURRENT_TIMESTAMP
-                           WHERE id = ?""",
-                        (year, album_id),
-                    )
-                fetched += 1
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 404:
-                    # Master doesn't exist — skip it
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.discard(future)
+                master_id, year, http_status, status = future.result()
+                if status != "skipped":
+                    pending_lookups.append((master_id, http_status, year, int(time.time())))
+                if status in ("ok", "missing"):
                     fetched += 1
-                elif e.response.status_code == 429:
-                    # Rate limited — wait and retry once
-                    if progress_callback:
-                        progress_callback("Rate limited, waiting 60s...", fetched, to_fetch)
-                    time.sleep(60)
-                    try:
-                        year = fetch_master_year(master_id)
-                        if year:
-                            cursor.execute(
-                                """UPDATE albums SET master_year = ?, updated_at = CURRENT_TIMESTAMP
-                                   WHERE id = ?""",
-                                (year, album_id),
-                            )
-                        fetched += 1
-                    except Exception:
-                        errors += 1
-                else:
+                    if year:
+                        pending_years.append((year, master_id))
+                    if fetched % 10 == 0 and progress_callback:
+                        progress_callback(
+                            f"Fetched {fetched}/{to_fetch} master years...", fetched, to_fetch
+                        )
+                elif status == "error":
                     errors += 1
-            except Exception:
-                errors += 1
 
-            # Commit every 50 records so progress isn't lost on failure
-            if fetched % 50 == 0:
-                conn.commit()
-
-            if progress_callback and fetched % 10 == 0:
-                progress_callback(
-                    f"Fetched {fetched}/{to_fetch} master years...", fetched, to_fetch
-                )
+                if cancel_event.is_set():
+                    stop_event.set()
+                else:
+                    submit_next()
 
-            time.sleep(DISCOGS_RATE_LIMIT_DELAY)
+            if len(pending_years) >= WRITE_BATCH_SIZE:
+                flush()
 
-        conn.commit()
+        flush()
 
         remaining = total - fetched
         results = {
             "fetched": fetched,
             "errors": errors,
             "remaining": remaining,
+            "albums_updated": albums_updated,
+            "cancelled": cancel_event.is_set(),
         }
 
         if progress_callback:
+            verb = "Cancelled" if cancel_event.is_set() else "Done"
             progress_callback(
-                f"Done! Fetched {fetched} master years ({errors} errors, {remaining} remaining).",
-                to_fetch,
+                f"{verb}! Fetched {fetched} master years for {albums_updated} albums "
+                f"({errors} errors, {remaining} masters remaining).",
+                fetched if cancel_event.is_set() else to_fetch,
                 to_fetch,
             )
 
         return results
 
     except requests.exceptions.ConnectionError:
-        conn.commit()  # Save what we got so far
+        stop_event.set()
+        flush()  # Save what we got so far
         raise RuntimeError(
             "Couldn't reach Discogs — check your internet connection and try again."
         )
-    except Exception:
-        conn.commit()  # Save what we got so far
+    except BaseException:
+        stop_event.set()
+        flush()  # Save what we got so far
         raise
+    finally:
+        pool.shutdown(wait=True)
+        conn.close()
+
+
+def iter_dump_master_years(dump_path):
+    """
+    Stream (master_id, year) pairs out of a Discogs masters data dump
+    (discogs_YYYYMMDD_masters.xml[.gz]) in constant memory.
+
+    year is None when the dump has no year for the master (it writes 0).
+    """
+    opener = gzip.open if dump_path.endswith(".gz") else open
+    with opener(dump_path, "rb") as f:
+        context = ET.iterparse(f, events=("start", "end"))
+        _, root = next(context)
+        for event, elem in context:
+            if event != "end" or elem.tag != "master":
+                continue
+            try:
+                master_id = int(elem.get("id"))
+            except (TypeError, ValueError):
+                master_id = None
+            year_text = (elem.findtext("year") or "").strip()
+            # Drop everything parsed so far so memory stays flat
+            root.clear()
+            if master_id is None:
+                continue
+            year = int(year_text) if year_text.isdigit() and int(year_text) else None
+            yield master_id, year
+
+
+def import_master_years_from_dump(dump_path, progress_callback=None):
+    """
+    Backfill master years from a locally downloaded Discogs masters dump,
+    without any API calls.
+
+    Only masters referenced by albums still missing a year are used. Each
+    one found is also recorded in master_lookups, so the API backfill
+    won't look it up again. Stops reading once every wanted master is
+    found.
+    Returns dict with results.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """SELECT DISTINCT discogs_master_id FROM albums
+           WHERE discogs_master_id IS NOT NULL
+             AND master_year IS NULL
+             AND is_removed = 0"""
+    )
+    wanted = set(row[0] for row in cursor.fetchall())
+    total = len(wanted)
+
+    scanned = 0
+    found = 0
+    albums_updated = 0
+    pending_years = []
+    pending_lookups = []
+
+    def flush():
+        nonlocal albums_updated
+        cursor.executemany(RECORD_LOOKUP_SQL, pending_lookups)
+        cursor.executemany(SET_MASTER_YEAR_SQL, pending_years)
+        albums_updated += cursor.rowcount if pending_years else 0
+        pending_lookups.clear()
+        pending_years.clear()
+        conn.commit()
+
+    if progress_callback:
+        progress_callback(f"Scanning dump for {total} masters...", 0, total)
+
+    try:
+        now = int(time.time())
+        for master_id, year in iter_dump_master_years(dump_path):
+            scanned += 1
+            if master_id in wanted:
+                wanted.discard(master_id)
+                found += 1
+                # Recorded like a successful API lookup
+                pending_lookups.append((master_id, 200, year, now))
+                if year:
+                    pending_years.append((year, master_id))
+                if len(pending_lookups) >= 1000:
+                    flush()
+                if not wanted:
+                    break
+
+            if progress_callback and scanned % 100000 == 0:
+                progress_callback(
+                    f"Scanned {scanned} masters, found {found}/{total}...", found, total
+                )
+
+        flush()
     finally:
         conn.close()
 
+    results = {
+        "scanned": scanned,
+        "found": found,
+        "albums_updated": albums_updated,
+        "missing": total - found,
+    }
+
+    if progress_callback:
+        progress_callback(
+            f"Done! Found {found}/{total} masters, updated {albums_updated} albums.",
+            total,
+            total,
+        )
+
+    return results
+
 
 if __name__ == "__main__":
     import sys
@@ -139,15 +342,31 @@ if __name__ == "__main__":
     def print_progress(msg, current, total):
         print(msg)
 
+    if len(sys.argv) > 2 and sys.argv[1] == "--dump":
+        print(f"Importing master years from {sys.argv[2]}...")
+        results = import_master_years_from_dump(sys.argv[2], progress_callback=print_progress)
+        print(f"\nDump import complete!")
+        print(f"  Scanned: {results['scanned']} masters")
+        print(f"  Found:   {results['found']}")
+        print(f"  Albums:  {results['albums_updated']}")
+        print(f"  Missing: {results['missing']}")
+        sys.exit(0)
+
     batch = int(sys.argv[1]) if len(sys.argv) > 1 else 0
     print("Starting master year sync...")
     if batch:
         print(f"(batch mode: fetching up to {batch})")
 
     try:
-        results = sync_master_years(progress_callback=print_progress, batch_size=batch)
+        try:
+            results = sync_master_years(progress_callback=print_progress, batch_size=batch)
+        except KeyboardInterrupt:
+            # Ctrl+C: stop cleanly; what was fetched so far has been saved
+            print("\nCancelled.")
+            sys.exit(1)
         print(f"\nMaster year sync complete!")
-        print(f"  Fetched:   {results['fetched']}")
+        print(f"  Fetched:   {results['fetched']} masters")
+        print(f"  Albums:    {results['albums_updated']}")
         print(f"  Errors:    {results['errors']}")
         print(f"  Remaining: {results['remaining']}")
     except Exception as e:
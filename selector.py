@@ -1,6 +1,10 @@
 import json
 import random
-from datetime import datetime, timezone
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+import numpy as np
 from db import get_db_connection
 
 
@@ -19,7 +23,8 @@ def get_eligible_albums(conn):
                   bb.rank AS big_board_rank, bb.year AS big_board_year
            FROM albums a
            LEFT JOIN big_board_entries bb ON bb.album_id = a.id
-           WHERE a.is_excluded = 0 AND a.is_removed = 0"""
+           WHERE a.is_excluded = 0 AND a.is_removed = 0
+           ORDER BY a.id, bb.id"""
     )
     return cursor.fetchall()
 
@@ -28,18 +33,13 @@ def get_listen_history(conn, album_id):
     """Get the most recent listen and total play count for an album."""
     cursor = conn.cursor()
     cursor.execute(
-        """SELECT selected_at, did_listen, skipped FROM listens
-           WHERE album_id = ?
-           ORDER BY selected_at DESC LIMIT 1""",
+        """SELECT datetime(last_selected, 'unixepoch') AS selected_at, selection_count
+           FROM album_listen_summary
+           WHERE album_id = ?""",
         (album_id,),
     )
     last = cursor.fetchone()
-
-    cursor.execute(
-        "SELECT COUNT(*) FROM listens WHERE album_id = ?",
-        (album_id,),
-    )
-    count = cursor.fetchone()[0]
+    count = last["selection_count"] if last else 0
 
     return last, count
 
@@ -53,30 +53,54 @@ def get_recent_selections(conn, n=10):
            FROM listens l
            JOIN albums a ON l.album_id = a.id
            LEFT JOIN big_board_entries bb ON bb.album_id = a.id
-           ORDER BY l.selected_at DESC
+           ORDER BY l.selected_epoch DESC, l.id DESC
            LIMIT ?""",
         (n,),
     )
     return cursor.fetchall()
 
 
-def calculate_weights(conn):
-    """
-    Calculate selection weights for all eligible albums.
-    Returns list of (album_row, weight) tuples.
-    """
-    albums = get_eligible_albums(conn)
-    if not albums:
-        return []
+def _base_weight(rank, max_rank):
+    """Weight from Big Board ranking (unranked albums get a flat 0.4)."""
+    if rank is not None:
+        return ((max_rank - rank + 1) / max_rank) ** 0.5
+    return 0.4
 
-    total_eligible = len(albums)
 
-    # Get max Big Board rank for normalization
-    ranked = [a["big_board_rank"] for a in albums if a["big_board_rank"] is not None]
-    max_rank = max(ranked) if ranked else 1
+def _recency_factor(days_since, cycle_length):
+    """Suppress recently selected albums until a full rotation has passed."""
+    if days_since is None:
+        return 1.0
+    return min(1.0, (max(days_since, 0.0) / cycle_length) ** 1.5)
 
-    # Get recent selections for variety bonus
-    recent = get_recent_selections(conn, n=10)
+
+def _variety_bonus(decade, genres, artist, recent_decades, recent_genres, recent_artists):
+    """Favour decades/genres missing from recent picks, penalize repeat artists."""
+    bonus = 1.0
+    if decade is not None and decade not in recent_decades:
+        bonus *= 1.3
+    if genres and not any(g in recent_genres for g in genres):
+        bonus *= 1.2
+    if artist in recent_artists:
+        bonus *= 0.3
+    return bonus
+
+
+# Upper bound of _variety_bonus, used by the sampler's rejection step
+MAX_VARIETY_BONUS = 1.3 * 1.2
+
+NEVER_PLAYED_BONUS = 1.5
+
+RECENT_WINDOW = 10
+
+
+def _album_decade(album):
+    year = get_display_year(album)
+    return (year // 10) * 10 if year else None
+
+
+def _recent_sets(recent):
+    """Build (decades, genres, artists) sets from recent selection rows."""
     recent_decades = set()
     recent_genres = set()
     recent_artists = set()
@@ -90,12 +114,37 @@ def calculate_weights(conn):
             recent_genres.add(g)
         recent_artists.add(r["artist"])
 
+    return recent_decades, recent_genres, recent_artists
+
+
+def calculate_weights_reference(conn, now=None):
+    """
+    Calculate selection weights for all eligible albums, one row at a time.
+    Returns list of (album_row, weight) tuples.
+
+    This is the readable reference for the weighting rules.
+    calculate_weights() computes the same weights over NumPy columns, and
+    SelectionSampler builds its envelope from those columns.
+    """
+    albums = get_eligible_albums(conn)
+    if not albums:
+        return []
+
+    total_eligible = len(albums)
+
+    # Get max Big Board rank for normalization
+    ranked = [a["big_board_rank"] for a in albums if a["big_board_rank"] is not None]
+    max_rank = max(ranked) if ranked else 1
+
+    # Get recent selections for variety bonus
+    recent = get_recent_selections(conn, n=RECENT_WINDOW)
+    recent_decades, recent_genres, recent_artists = _recent_sets(recent)
+
     # Pre-fetch all listen data in bulk for performance
     cursor = conn.cursor()
     cursor.execute(
-        """SELECT album_id, MAX(selected_at) as last_selected, COUNT(*) as play_count
-           FROM listens
-           GROUP BY album_id"""
+        """SELECT album_id, last_selected, selection_count AS play_count
+           FROM album_listen_summary"""
     )
     listen_data = {}
     for row in cursor.fetchall():
@@ -104,54 +153,33 @@ def calculate_weights(conn):
             "play_count": row["play_count"],
         }
 
-    now = datetime.now(timezone.utc)
+    now = now or datetime.now(timezone.utc)
     cycle_length = total_eligible / 1.5
 
     results = []
 
     for album in albums:
         # --- Base weight (from Big Board ranking) ---
-        if album["big_board_rank"] is not None:
-            base_weight = ((max_rank - album["big_board_rank"] + 1) / max_rank) ** 0.5
-        else:
-            base_weight = 0.4
+        base_weight = _base_weight(album["big_board_rank"], max_rank)
 
         # --- Recency factor ---
         album_listens = listen_data.get(album["id"])
-        if album_listens and album_listens["last_selected"]:
-            last_str = album_listens["last_selected"]
-            try:
-                last_dt = datetime.fromisoformat(last_str).replace(tzinfo=timezone.utc)
-            except (ValueError, TypeError):
-                last_dt = datetime.strptime(last_str, "%Y-%m-%d %H:%M:%S").replace(
-                    tzinfo=timezone.utc
-                )
+        if album_listens and album_listens["last_selected"] is not None:
+            last_dt = datetime.fromtimestamp(album_listens["last_selected"], timezone.utc)
             days_since = (now - last_dt).total_seconds() / 86400
-            recency_factor = min(1.0, (days_since / cycle_length) ** 1.5)
         else:
-            recency_factor = 1.0
+            days_since = None
+        recency_factor = _recency_factor(days_since, cycle_length)
 
         # --- Variety bonus ---
-        variety_bonus = 1.0
-
-        display_year = get_display_year(album)
-        if display_year:
-            album_decade = (display_year // 10) * 10
-            if album_decade not in recent_decades:
-                variety_bonus *= 1.3
-
         album_genres = json.loads(album["genres"]) if album["genres"] else []
-        if album_genres and not any(g in recent_genres for g in album_genres):
-            variety_bonus *= 1.2
-
-        if album["artist"] in recent_artists:
-            variety_bonus *= 0.3
+        variety_bonus = _variety_bonus(
+            _album_decade(album), album_genres, album["artist"],
+            recent_decades, recent_genres, recent_artists,
+        )
 
         # --- Never-played bonus ---
-        if not album_listens:
-            never_played_bonus = 1.5
-        else:
-            never_played_bonus = 1.0
+        never_played_bonus = NEVER_PLAYED_BONUS if not album_listens else 1.0
 
         # --- Final weight ---
         final_weight = base_weight * recency_factor * variety_bonus * never_played_bonus
@@ -160,62 +188,563 @@ def calculate_weights(conn):
     return results
 
 
-def select_next_album():
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Album filters for _load_weight_columns(): the selectable pool, or every
+# album still in the collection (the sampler keeps excluded albums as
+# zero-weight slots so they can be un-excluded in place)
+_ELIGIBLE = "a.is_excluded = 0 AND a.is_removed = 0"
+_IN_COLLECTION = "a.is_removed = 0"
+
+# Separates text values in group_concat() (ASCII unit separator)
+_UNIT_SEPARATOR = "\x1f"
+
+
+def _int_column(text):
+    """Parse a group_concat() of integers (NULL when there were no rows)."""
+    return np.fromstring(text or "", dtype=np.int64, sep=",")
+
+
+def _load_weight_columns(conn, where=_ELIGIBLE):
     """
-    Select the next album to play using weighted random selection.
-    Returns a dict with album info, or None if no eligible albums.
+    Load the weighting inputs of the albums matching `where` as NumPy
+    columns, one element per row of the albums/Big Board join ordered by
+    (album id, entry id), like get_eligible_albums().
+
+    Display decades and listen state are computed in SQL, and each column
+    comes back as a single group_concat() string parsed by NumPy, so no
+    album is handled one at a time in Python. Genres are exploded with
+    json_each into a boolean album x genre matrix.
     """
-    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""SELECT group_concat(id), group_concat(entry_id), group_concat(rank),
+                   group_concat(played), group_concat(last_selected), group_concat(decade),
+                   group_concat(is_excluded), group_concat(artist, char(31))
+            FROM (
+                SELECT a.id, COALESCE(bb.id, 0) AS entry_id, COALESCE(bb.rank, 0) AS rank,
+                       s.album_id IS NOT NULL AS played,
+                       COALESCE(s.last_selected, -1) AS last_selected,
+                       COALESCE(
+                           COALESCE(NULLIF(a.master_year_override, 0), NULLIF(bb.year, 0),
+                                    NULLIF(a.master_year, 0), NULLIF(a.release_year, 0)) / 10 * 10,
+                           -1
+                       ) AS decade,
+                       COALESCE(a.is_excluded, 0) AS is_excluded, a.artist
+                FROM albums a
+                LEFT JOIN big_board_entries bb ON bb.album_id = a.id
+                LEFT JOIN album_listen_summary s ON s.album_id = a.id
+                WHERE {where}
+            )"""
+    )
+    row = cursor.fetchone()
+    ids, entry_ids, rank, played, last_selected, decade, excluded = map(_int_column, row[:7])
+    artist = np.array(row[7].split(_UNIT_SEPARATOR) if row[7] is not None else [], dtype=object)
 
-    try:
-        weighted = calculate_weights(conn)
-        if not weighted:
-            return None
+    # group_concat() keeps the columns aligned but doesn't promise an order
+    order = np.lexsort((entry_ids, ids))
+
+    cursor.execute(
+        f"""SELECT group_concat(a.id), group_concat(g.value, char(31))
+            FROM albums a, json_each(NULLIF(a.genres, '')) g
+            WHERE {where} AND g.value IS NOT NULL"""
+    )
+    genre_album_ids, genre_values = cursor.fetchone()
+    genre_names, genre_codes = np.unique(
+        np.array(genre_values.split(_UNIT_SEPARATOR) if genre_values is not None else [], dtype=str),
+        return_inverse=True,
+    )
+    album_ids, album_of_row = np.unique(ids, return_inverse=True)
+    genres = np.zeros((len(album_ids), len(genre_names)), dtype=bool)
+    genres[np.searchsorted(album_ids, _int_column(genre_album_ids)), genre_codes] = True
+
+    rank = rank[order].astype(float)
+    rank[rank < 1] = np.nan
+    last_selected = last_selected[order]
+    return {
+        "ids": ids[order],
+        "entry_ids": entry_ids[order],
+        "rank": rank,
+        "played": played[order].astype(bool),
+        "has_last": last_selected >= 0,
+        "last_epoch": np.maximum(last_selected, 0),
+        "decade": decade[order],
+        "excluded": excluded[order].astype(bool),
+        "artist": artist[order],
+        "genres": genres[album_of_row[order]],
+        "genre_names": genre_names,
+    }
+
+
+def _weights_from_columns(cols, now, cycle_length, max_rank, recent_sets=None):
+    """
+    Compute every row's weight from _load_weight_columns() output at
+    datetime `now`. Without recent_sets every album gets the maximum
+    variety bonus, which is what SelectionSampler's envelope needs.
+    """
+    n = len(cols["ids"])
+    rank = cols["rank"]
+
+    # --- Base weight (from Big Board ranking) ---
+    base_weight = np.where(~np.isnan(rank), ((max_rank - rank + 1) / max_rank) ** 0.5, 0.4)
+
+    # --- Recency factor ---
+    # Integer microseconds, then one division, like timedelta.total_seconds()
+    now_us = (now - _EPOCH) // timedelta(microseconds=1)
+    seconds_since = (now_us - cols["last_epoch"] * 1_000_000) / 1_000_000
+    days_since = np.maximum(seconds_since / 86400, 0.0)
+    recency_factor = np.where(
+        cols["has_last"], np.minimum(1.0, (days_since / cycle_length) ** 1.5), 1.0
+    )
 
-        albums, weights = zip(*weighted)
-        selected = random.choices(albums, weights=weights, k=1)[0]
+    # --- Variety bonus ---
+    if recent_sets is None:
+        variety_bonus = np.full(n, MAX_VARIETY_BONUS)
+    else:
+        recent_decades, recent_genres, recent_artists = recent_sets
+        decade = cols["decade"]
+        genres = cols["genres"]
+        in_recent_genres = genres[:, np.isin(cols["genre_names"], list(recent_genres))].any(axis=1)
+
+        variety_bonus = np.ones(n)
+        variety_bonus = np.where(
+            (decade >= 0) & ~np.isin(decade, list(recent_decades)), variety_bonus * 1.3, variety_bonus
+        )
+        variety_bonus = np.where(
+            genres.any(axis=1) & ~in_recent_genres, variety_bonus * 1.2, variety_bonus
+        )
+        variety_bonus = np.where(
+            np.isin(cols["artist"], list(recent_artists)), variety_bonus * 0.3, variety_bonus
+        )
+
+    # --- Never-played bonus ---
+    never_played_bonus = np.where(cols["played"], 1.0, NEVER_PLAYED_BONUS)
+
+    return base_weight * recency_factor * variety_bonus * never_played_bonus
+
+
+def calculate_weights(conn, now=None):
+    """
+    Calculate selection weights for all eligible albums using NumPy columns.
+    Returns list of (album_row, weight) tuples, matching
+    calculate_weights_reference() up to float rounding (NumPy's power()
+    can differ from libm's pow() in the last bit).
+    """
+    albums = get_eligible_albums(conn)
+    if not albums:
+        return []
 
-        # Get play history for this album
-        last_listen, times_played = get_listen_history(conn, selected["id"])
+    cols = _load_weight_columns(conn)
+    ranked = cols["rank"][~np.isnan(cols["rank"])]
+    max_rank = ranked.max() if ranked.size else 1
+    recent_sets = _recent_sets(get_recent_selections(conn, n=RECENT_WINDOW))
+    weights = _weights_from_columns(
+        cols, now or datetime.now(timezone.utc), len(albums) / 1.5, max_rank, recent_sets
+    )
+    return list(zip(albums, weights.tolist()))
+
+
+class _FenwickTree:
+    """Binary indexed tree over non-negative floats with O(log n) sampling."""
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=float)
+        self.size = len(values)
+        self.values = values.tolist()
+        # Build level by level: every node whose lowest set bit is `step`
+        # is complete once the lower levels are done, and adds itself to
+        # its parent (i + step). Parents within a level are distinct.
+        tree = np.concatenate(([0.0], values))
+        step = 1
+        while step <= self.size:
+            nodes = np.arange(step, self.size + 1, 2 * step)
+            nodes = nodes[nodes + step <= self.size]
+            tree[nodes + step] += tree[nodes]
+            step *= 2
+        self.tree = tree.tolist()
+
+    def total(self):
+        total = 0.0
+        i = self.size
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def set(self, index, value):
+        delta = value - self.values[index]
+        self.values[index] = value
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def find(self, target):
+        """Return the index whose cumulative range contains target."""
+        pos = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and self.tree[nxt] <= target:
+                pos = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return min(pos, self.size - 1)
+
+
+class SelectionSampler:
+    """
+    Long-lived weighted sampler over the selectable albums.
+
+    The weighting inputs (see _load_weight_columns), listen stats and
+    recent picks are loaded once and kept in memory. Each album slot
+    holds an *envelope* weight in a Fenwick tree: its weight with the
+    maximum variety bonus, and with the recency factor evaluated at the
+    end of the envelope's horizon. A pick proposes a slot from the tree
+    and accepts it with probability real_weight / envelope, so picks
+    follow exactly the same distribution as calculate_weights() while
+    costing O(log n) instead of a full table scan.
+
+    The tree is updated in place when an album is selected, played,
+    excluded or un-excluded. Anything that changes album metadata (syncs,
+    overrides, Big Board matching) calls invalidate(), and the next pick
+    rebuilds from the database.
+
+    prefetch() draws the next pick ahead of time (rebuilding first if
+    needed). Any state change discards it, so a prefetched pick is only
+    served if it is still a valid draw from the current pool.
+    """
 
-        # Record the selection in listens table
+    # Envelope weights stay valid for this long before a rebuild
+    ENVELOPE_HORIZON = 3600
+    # Exclusions tolerated before the shrinking pool invalidates the envelope
+    ENVELOPE_COUNT_SLACK = 25
+    MAX_ATTEMPTS = 1000
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._stale = True
+        self._prefetched = None
+
+    def invalidate(self):
+        """Force a full rebuild from the database on the next pick."""
+        with self.lock:
+            self._stale = True
+            self._prefetched = None
+
+    def _build(self, conn):
+        self._prefetched = None
+        cols = _load_weight_columns(conn, _IN_COLLECTION)
+
+        # Oldest first, so appending a new pick pushes out the oldest one
+        self.recent = deque(maxlen=RECENT_WINDOW)
+        for r in reversed(get_recent_selections(conn, n=RECENT_WINDOW)):
+            year = r["master_year_override"] or r["big_board_year"] or r["master_year"] or r["release_year"]
+            genres = json.loads(r["genres"]) if r["genres"] else []
+            self.recent.append(((year // 10) * 10 if year else None, genres, r["artist"]))
+
+        # One slot per row of the albums/Big Board join, ordered by album id,
+        # so an album's slots are a contiguous range found by binary search.
+        # Album rows themselves are only loaded for the slot that gets picked.
+        self.album_ids = cols["ids"]
+        self.slot_albums = cols["ids"].tolist()
+        self.slot_entries = cols["entry_ids"].tolist()
+        self.artists = cols["artist"].tolist()
+        self.ranks = np.where(np.isnan(cols["rank"]), None, cols["rank"]).tolist()
+        self.decades = np.where(cols["decade"] >= 0, cols["decade"], None).tolist()
+        self.genres = cols["genres"]
+        self.genre_names = cols["genre_names"]
+        active = ~cols["excluded"]
+        self.active = active.tolist()
+        self.played = cols["played"].tolist()
+        self.last_selected = np.where(cols["has_last"], cols["last_epoch"], None).tolist()
+
+        self.count = int(active.sum())
+        ranked = cols["rank"][active & ~np.isnan(cols["rank"])]
+        self.max_rank = int(ranked.max()) if ranked.size else 1
+
+        self.envelope_until = time.time() + self.ENVELOPE_HORIZON
+        self.envelope_min_count = max(self.count - self.ENVELOPE_COUNT_SLACK, 1)
+        self.envelope_cycle = self.envelope_min_count / 1.5
+        # Excluded albums can rank past max_rank; they get no weight anyway
+        with np.errstate(invalid="ignore"):
+            envelope = _weights_from_columns(
+                cols,
+                datetime.fromtimestamp(self.envelope_until, timezone.utc),
+                self.envelope_cycle,
+                self.max_rank,
+            )
+        self.tree = _FenwickTree(np.where(active, envelope, 0.0))
+        self._stale = False
+
+    def _slots(self, album_id):
+        left, right = np.searchsorted(self.album_ids, [album_id, album_id + 1])
+        return range(int(left), int(right))
+
+    def _slot_genres(self, i):
+        return self.genre_names[self.genres[i]].tolist()
+
+    def _album_row(self, conn, i):
+        """Load the album row behind slot i (its own Big Board entry, if any)."""
         cursor = conn.cursor()
         cursor.execute(
-            "INSERT INTO listens (album_id) VALUES (?)",
-            (selected["id"],),
+            """SELECT a.id, a.artist, a.title, a.release_year, a.master_year,
+                      a.master_year_override, a.cover_image_url, a.genres, a.styles,
+                      a.format, a.discogs_url, a.master_url, a.is_excluded,
+                      bb.rank AS big_board_rank, bb.year AS big_board_year
+               FROM albums a
+               LEFT JOIN big_board_entries bb ON bb.album_id = a.id
+               WHERE a.id = ?
+               ORDER BY COALESCE(bb.id, 0) = ? DESC, bb.id
+               LIMIT 1""",
+            (self.slot_albums[i], self.slot_entries[i]),
         )
-        listen_id = cursor.lastrowid
-        conn.commit()
-
-        display_year = get_display_year(selected)
-        genres = json.loads(selected["genres"]) if selected["genres"] else []
-        styles = json.loads(selected["styles"]) if selected["styles"] else []
-
-        return {
-            "album_id": selected["id"],
-            "listen_id": listen_id,
-            "artist": selected["artist"],
-            "title": selected["title"],
-            "display_year": display_year,
-            "release_year": selected["release_year"],
-            "master_year": selected["master_year"],
-            "master_year_override": selected["master_year_override"],
-            "cover_image_url": selected["cover_image_url"],
-            "genres": genres,
-            "styles": styles,
-            "format": selected["format"],
-            "big_board_rank": selected["big_board_rank"],
-            "discogs_url": selected["discogs_url"],
-            "master_url": selected["master_url"],
-            "times_played": times_played,
-            "last_played": (
-                last_listen["selected_at"] if last_listen else None
-            ),
-        }
+        return cursor.fetchone()
+
+    def _weight(self, i, now, cycle_length, recent_sets=None, max_variety=False):
+        last = self.last_selected[i]
+        days_since = (now - last) / 86400 if last is not None else None
+        if max_variety:
+            variety = MAX_VARIETY_BONUS
+        else:
+            variety = _variety_bonus(
+                self.decades[i], self._slot_genres(i), self.artists[i], *recent_sets
+            )
+        return (
+            _base_weight(self.ranks[i], self.max_rank)
+            * _recency_factor(days_since, cycle_length)
+            * variety
+            * (1.0 if self.played[i] else NEVER_PLAYED_BONUS)
+        )
+
+    def _envelope(self, i):
+        if not self.active[i]:
+            return 0.0
+        return self._weight(i, self.envelope_until, self.envelope_cycle, max_variety=True)
+
+    def _recent_sets(self):
+        recent_decades = set()
+        recent_genres = set()
+        recent_artists = set()
+        for decade, genres, artist in self.recent:
+            if decade is not None:
+                recent_decades.add(decade)
+            recent_genres.update(genres)
+            recent_artists.add(artist)
+        return recent_decades, recent_genres, recent_artists
+
+    def _ensure_fresh(self, conn):
+        if (
+            self._stale
+            or time.time() >= self.envelope_until
+            or self.count < self.envelope_min_count
+        ):
+            self._build(conn)
+
+    def _draw(self, exclude=()):
+        """
+        Draw one slot index, or None if nothing is eligible. Albums whose
+        ids are in `exclude` are left out of the draw.
+        """
+        if self.count == 0:
+            return None
+
+        now = time.time()
+        cycle_length = self.count / 1.5
+        recent_sets = self._recent_sets()
+
+        total = self.tree.total()
+        for _ in range(self.MAX_ATTEMPTS):
+            i = self.tree.find(random.random() * total)
+            envelope = self.tree.values[i]
+            if envelope <= 0 or self.slot_albums[i] in exclude:
+                continue
+            if random.random() * envelope < self._weight(i, now, cycle_length, recent_sets):
+                return i
+
+        # Pathological pool (e.g. every weight is ~0): fall back to an
+        # exact draw over the in-memory slots.
+        active = [
+            i for i in range(len(self.slot_albums))
+            if self.active[i] and self.slot_albums[i] not in exclude
+        ]
+        if not active:
+            return None
+        weights = [self._weight(i, now, cycle_length, recent_sets) for i in active]
+        return random.choices(active, weights=weights, k=1)[0]
+
+    def _draw_album(self, conn, exclude=()):
+        i = self._draw(exclude)
+        return self._album_row(conn, i) if i is not None else None
+
+    def pick(self, conn, exclude=()):
+        """
+        Draw one album row, or None if nothing is eligible. Album ids in
+        `exclude` are never picked.
+        """
+        with self.lock:
+            self._ensure_fresh(conn)
+            if self._prefetched is not None:
+                selected, self._prefetched = self._prefetched, None
+                if selected["id"] not in exclude:
+                    return selected
+            return self._draw_album(conn, exclude)
+
+    def prefetch(self, conn):
+        """Rebuild if needed and hold the next pick for pick() to return."""
+        with self.lock:
+            self._ensure_fresh(conn)
+            if self._prefetched is None:
+                self._prefetched = self._draw_album(conn)
+
+    def record_selection(self, album_id):
+        """Account for a new listens row for album_id."""
+        with self.lock:
+            self._prefetched = None
+            if self._stale:
+                return
+            slots = self._slots(album_id)
+            if not slots:
+                # Album isn't loaded (e.g. removed) but still counts as recent
+                self._stale = True
+                return
+            now = time.time()
+            for i in slots:
+                self.last_selected[i] = now
+                self.played[i] = True
+                self.tree.set(i, self._envelope(i))
+            i = slots[0]
+            self.recent.append((self.decades[i], self._slot_genres(i), self.artists[i]))
+
+    def set_excluded(self, album_id, excluded):
+        """Remove an album from (or return it to) the pool."""
+        with self.lock:
+            self._prefetched = None
+            if self._stale:
+                return
+            for i in self._slots(album_id):
+                if self.active[i] == (not excluded):
+                    continue
+                self.active[i] = not excluded
+                self.count += -1 if excluded else 1
+                rank = self.ranks[i]
+                # The rank normalization only widens safely; anything else
+                # changes every base weight, so rebuild.
+                if rank is not None and (rank > self.max_rank or (excluded and rank == self.max_rank)):
+                    self._stale = True
+                    return
+                self.tree.set(i, self._envelope(i))
+
+
+sampler = SelectionSampler()
+
+
+def _prefetch_worker():
+    conn = get_db_connection()
+    try:
+        sampler.prefetch(conn)
+    except Exception:
+        # Best effort — /api/next simply computes the pick itself
+        sampler.invalidate()
+    finally:
+        conn.close()
+
+
+def prefetch_next_album():
+    """Precompute the next pick in a background thread."""
+    threading.Thread(target=_prefetch_worker, daemon=True).start()
+
+
+MAX_BATCH_SIZE = 50
+
+
+def _selection_result(selected, listen_id, last_listen, times_played):
+    """Shape a picked album row into the /api/next payload."""
+    display_year = get_display_year(selected)
+    genres = json.loads(selected["genres"]) if selected["genres"] else []
+    styles = json.loads(selected["styles"]) if selected["styles"] else []
+
+    return {
+        "album_id": selected["id"],
+        "listen_id": listen_id,
+        "artist": selected["artist"],
+        "title": selected["title"],
+        "display_year": display_year,
+        "release_year": selected["release_year"],
+        "master_year": selected["master_year"],
+        "master_year_override": selected["master_year_override"],
+        "cover_image_url": selected["cover_image_url"],
+        "genres": genres,
+        "styles": styles,
+        "format": selected["format"],
+        "big_board_rank": selected["big_board_rank"],
+        "discogs_url": selected["discogs_url"],
+        "master_url": selected["master_url"],
+        "times_played": times_played,
+        "last_played": (
+            last_listen["selected_at"] if last_listen else None
+        ),
+    }
+
+
+def select_next_albums(n):
+    """
+    Select up to n albums in one pass, e.g. to queue up an evening's records.
+    No album appears twice in a batch, so asking for more albums than are
+    eligible returns each of them once.
+
+    Each pick is fed back into the sampler before the next draw, so the
+    recency and artist/decade/genre variety rules apply between consecutive
+    picks exactly as they would across n separate selections. All listens
+    are recorded in a single transaction.
+    Returns a list of album dicts (empty if no eligible albums).
+    """
+    n = max(1, min(n, MAX_BATCH_SIZE))
+    conn = get_db_connection()
+
+    try:
+        with sampler.lock:
+            results = []
+            picked = set()
+            try:
+                cursor = conn.cursor()
+                for _ in range(n):
+                    selected = sampler.pick(conn, exclude=picked)
+                    if selected is None:
+                        break
+                    picked.add(selected["id"])
+
+                    # Get play history for this album
+                    last_listen, times_played = get_listen_history(conn, selected["id"])
+
+                    # Record the selection in listens table
+                    cursor.execute(
+                        "INSERT INTO listens (album_id) VALUES (?)",
+                        (selected["id"],),
+                    )
+                    sampler.record_selection(selected["id"])
+                    results.append(
+                        _selection_result(selected, cursor.lastrowid, last_listen, times_played)
+                    )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                sampler.invalidate()
+                raise
+        return results
     finally:
         conn.close()
 
 
+def select_next_album():
+    """
+    Select the next album to play using weighted random selection.
+    Returns a dict with album info, or None if no eligible albums.
+    """
+    results = select_next_albums(1)
+    return results[0] if results else None
+
+
 if __name__ == "__main__":
     print("Testing selection algorithm...\n")
 
@@ -19,6 +19,9 @@ PORT = 3345
 def open_browser():
     webbrowser.open(f"http://localhost:{PORT}")
 
-init_db()
-threading.Timer(1.0, open_browser).start()
-app.run(port=PORT)
+# Guarded so Big Board matching's worker processes, which re-import this
+# module on Windows, don't start a second server
+if __name__ == "__main__":
+    init_db()
+    threading.Timer(1.0, open_browser).start()
+    app.run(port=PORT)
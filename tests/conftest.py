@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    """Connection to a fresh, initialized database in tmp_path."""
+    monkeypatch.setattr(db, "DATABASE_PATH", str(tmp_path / "test.db"))
+    db.init_db()
+    conn = db.get_db_connection()
+    yield conn
+    conn.close()
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from bigboard_sync import (
+    CANDIDATE_LIMIT,
+    MATCH_THRESHOLD,
+    AlbumMatcher,
+    find_best_match,
+    normalize_for_matching,
+)
+
+
+def make_board(n_albums=600, n_owned=80, n_unowned=30, seed=7):
+    """
+    A synthetic collection and a Big Board written against it, from a small
+    vocabulary so that many albums share words. Owned entries
+    are spelled the way list makers do (case, moved "The", typos, dropped
+    edition suffixes, extra artists, reordered words). Returns
+    (albums, entries, labels), labels[i] being the album entry i was
+    written from, or None for an album the collection doesn't hold.
+    """
+    rnd = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocab = sorted({
+        "".join(rnd.choice(letters) for _ in range(rnd.randint(3, 9))) for _ in range(150)
+    })
+
+    def phrase(lo, hi):
+        return " ".join(rnd.choice(vocab).capitalize() for _ in range(rnd.randint(lo, hi)))
+
+    artists = [
+        ("The " if rnd.random() < 0.15 else "") + phrase(1, 3) for _ in range(n_albums // 4)
+    ]
+    albums = []
+    for i in range(n_albums):
+        title = phrase(1, 5)
+        if rnd.random() < 0.1:
+            title += rnd.choice([" (Remastered)", ": Deluxe Edition", " - Live"])
+        albums.append({"id": i + 1, "artist": rnd.choice(artists), "title": title})
+    for album in albums:
+        album["artist_key"] = normalize_for_matching(album["artist"])
+        album["title_key"] = normalize_for_matching(album["title"])
+
+    entries, labels = [], []
+    for album in rnd.sample(albums, n_owned):
+        artist, title = album["artist"], album["title"]
+        kind = rnd.randrange(6)
+        if kind == 1:
+            artist = artist.upper()
+            if artist.startswith("THE "):
+                artist = artist[4:] + ", THE"
+        elif kind == 2:
+            j = rnd.randrange(len(title) - 1)
+            title = title[:j] + title[j + 1] + title[j] + title[j + 2:]
+        elif kind == 3:
+            title = title.split(" (")[0].split(":")[0].split(" - ")[0]
+        elif kind == 4:
+            artist += ", " + phrase(1, 2)
+        elif kind == 5:
+            words = title.split()
+            rnd.shuffle(words)
+            title = " ".join(words)
+        entries.append({"artist": artist, "title": title})
+        labels.append(album["id"])
+    for _ in range(n_unowned):
+        entries.append({"artist": phrase(1, 3), "title": phrase(1, 4)})
+        labels.append(None)
+    return albums, entries, labels
+
+
+@pytest.fixture(scope="module")
+def board():
+    albums, entries, labels = make_board()
+    exhaustive = [find_best_match(entry, albums) for entry in entries]
+    return albums, entries, labels, exhaustive
+
+
+def test_blocking_finds_every_exhaustive_match(board):
+    albums, entries, labels, exhaustive = board
+    matcher = AlbumMatcher(albums)
+    assert len(albums) > CANDIDATE_LIMIT and matcher.blocking
+
+    blocked = matcher.best_matches(entries)
+    matched = 0
+    for entry, (expected, expected_score), (album, score) in zip(entries, exhaustive, blocked):
+        if expected_score < MATCH_THRESHOLD:
+            continue
+        matched += 1
+        assert album is not None, entry
+        assert album["id"] == expected["id"], entry
+        assert score == pytest.approx(expected_score)
+    assert matched >= 0.9 * sum(label is not None for label in labels)
+
+
+def test_blocking_recall_matches_exhaustive_recall(board):
+    albums, entries, labels, exhaustive = board
+
+    def found(results):
+        return [
+            album["id"] if album is not None and score >= MATCH_THRESHOLD else None
+            for album, score in results
+        ]
+
+    exhaustive_hits = sum(
+        f == label for f, label in zip(found(exhaustive), labels) if label is not None
+    )
+    blocked_hits = sum(
+        f == label
+        for f, label in zip(found(AlbumMatcher(albums).best_matches(entries)), labels)
+        if label is not None
+    )
+    assert blocked_hits == exhaustive_hits
+    assert exhaustive_hits >= 0.9 * sum(label is not None for label in labels)
+
+
+def test_board_catches_a_narrow_candidate_list(board):
+    # Guards the fixture: with too few candidates blocking does miss matches
+    albums, entries, labels, exhaustive = board
+    narrow = AlbumMatcher(albums, top_k=10).best_matches(entries)
+    assert any(
+        score >= MATCH_THRESHOLD and (album is None or album["id"] != expected["id"])
+        for (expected, score), (album, _) in zip(exhaustive, narrow)
+    )
@@ -0,0 +1,111 @@
+import csv
+
+import pytest
+
+import discogs_sync
+
+
+def make_item(release_id, cover="a"):
+    return {
+        "basic_information": {
+            "id": release_id,
+            "master_id": release_id + 1000,
+            "title": f"Release {release_id}",
+            "year": 1980,
+            "artists": [{"name": f"Artist {release_id}"}],
+            "formats": [{"name": "Vinyl"}],
+            "genres": ["Rock"],
+            "styles": [],
+            "cover_image": f"https://img.example/{release_id}-{cover}.jpg",
+        }
+    }
+
+
+@pytest.fixture
+def collection(conn, monkeypatch):
+    """A fake Discogs collection served 100 items a page; fail_page raises once."""
+    state = {"items": [make_item(i) for i in range(1, 251)], "fail_page": None}
+
+    def fetch(page=1, per_page=100, username=None):
+        if page == state["fail_page"]:
+            state["fail_page"] = None
+            raise RuntimeError("connection dropped")
+        items = state["items"]
+        return {
+            "pagination": {"pages": -(-len(items) // per_page), "items": len(items)},
+            "releases": items[(page - 1) * per_page : page * per_page],
+        }
+
+    monkeypatch.setattr(discogs_sync, "DISCOGS_TOKEN", "token")
+    monkeypatch.setattr(discogs_sync, "fetch_collection_page", fetch)
+    return state
+
+
+def test_restarted_resume_keeps_updates_from_the_earlier_attempt(conn, collection):
+    assert discogs_sync.sync_collection(mode="full")["added"] == 250
+
+    # Every cover changes; the sync dies after committing page 1
+    collection["items"] = [make_item(i, cover="b") for i in range(1, 251)]
+    collection["fail_page"] = 2
+    with pytest.raises(RuntimeError):
+        discogs_sync.sync_collection(mode="full")
+
+    # A new release shifts the pages, so the resumed run starts over
+    collection["items"].insert(0, make_item(251))
+    results = discogs_sync.sync_collection(mode="full")
+
+    assert results["added"] == 1
+    assert results["updated"] == 250
+    assert results["unchanged"] == 0
+    assert results["total_fetched"] == 251
+    row = conn.execute(
+        "SELECT albums_added, albums_updated FROM sync_log ORDER BY id DESC LIMIT 1"
+    ).fetchone()
+    assert tuple(row) == (1, 250)
+
+
+def write_export(path, rows):
+    """Write a minimal collection CSV export from (release_id, year) pairs."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Catalog#", "Artist", "Title", "Label", "Format", "Released", "release_id"])
+        for release_id, year in rows:
+            writer.writerow(
+                ["CAT-1", f"Artist {release_id}", f"Release {release_id}", "Label",
+                 "LP, Album, RE", year, release_id]
+            )
+    return str(path)
+
+
+def test_csv_import_only_updates_albums_it_fills_in(conn, tmp_path):
+    conn.executemany(
+        """INSERT INTO albums (discogs_release_id, artist, title, release_year, format,
+                               is_removed, updated_at)
+           VALUES (?, 'Artist', 'Title', ?, 'Vinyl', ?, '2020-01-01 00:00:00')""",
+        [(1, 1975, 0), (2, None, 0), (3, None, 0), (4, 1980, 1)],
+    )
+    conn.commit()
+    path = write_export(tmp_path / "export.csv", [(1, 1999), (2, 1972), (3, ""), (4, 1980), (5, 1990)])
+
+    results = discogs_sync.import_collection_csv(path)
+
+    assert results == {"added": 1, "updated": 2, "skipped": 0}
+    rows = {
+        row["discogs_release_id"]: tuple(row)[1:]
+        for row in conn.execute(
+            """SELECT discogs_release_id, release_year, format, is_removed,
+                      updated_at = '2020-01-01 00:00:00'
+               FROM albums"""
+        )
+    }
+    assert rows == {
+        1: (1975, "Vinyl", 0, 1),
+        2: (1972, "Vinyl", 0, 0),
+        3: (None, "Vinyl", 0, 1),
+        4: (1980, "Vinyl", 0, 0),
+        # The export's "LP" isn't an API format name; an API sync fills it
+        5: (1990, None, 0, 0),
+    }
+
+    # Nothing left to fill: a second import changes nothing
+    assert discogs_sync.import_collection_csv(path) == {"added": 0, "updated": 0, "skipped": 0}
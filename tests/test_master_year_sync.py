@@ -0,0 +1,72 @@
+import gzip
+
+import pytest
+
+import master_year_sync
+
+
+def write_dump(path, masters):
+    """Write a minimal discogs_*_masters.xml.gz with (id, year) pairs; year None omits it."""
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<masters>\n')
+        for master_id, year in masters:
+            year_xml = f"<year>{year}</year>" if year is not None else ""
+            f.write(
+                f'<master id="{master_id}"><main_release>{master_id * 10}</main_release>'
+                f"{year_xml}<title>Master {master_id}</title></master>\n"
+            )
+        f.write("</masters>\n")
+    return str(path)
+
+
+@pytest.fixture
+def dump(tmp_path):
+    masters = [(1, 1971), (2, 0), (3, None), (4, 1985)]
+    masters += [(master_id, 2000) for master_id in range(5, 5005)]
+    return write_dump(tmp_path / "discogs_20240101_masters.xml.gz", masters)
+
+
+def add_albums(conn, master_ids):
+    conn.executemany(
+        """INSERT INTO albums (discogs_release_id, discogs_master_id, artist, title)
+           VALUES (?, ?, 'Artist', 'Title')""",
+        [(1000 + i, master_id) for i, master_id in enumerate(master_ids)],
+    )
+    conn.commit()
+
+
+def test_iter_dump_master_years_maps_zero_and_missing_years_to_none(dump):
+    years = dict(master_year_sync.iter_dump_master_years(dump))
+
+    assert years[1] == 1971
+    assert years[2] is None
+    assert years[3] is None
+    assert len(years) == 5004
+
+
+def test_import_stops_once_every_wanted_master_is_found(conn, dump):
+    add_albums(conn, [1, 4])
+
+    results = master_year_sync.import_master_years_from_dump(dump)
+
+    assert results["found"] == 2
+    assert results["missing"] == 0
+    assert results["scanned"] == 4
+
+
+def test_import_fills_years_and_records_master_lookups(conn, dump):
+    add_albums(conn, [1, 2, 4, 4, 99999])
+
+    results = master_year_sync.import_master_years_from_dump(dump)
+
+    assert results == {"scanned": 5004, "found": 3, "albums_updated": 3, "missing": 1}
+    lookups = {
+        row["master_id"]: (row["status"], row["year"])
+        for row in conn.execute("SELECT master_id, status, year FROM master_lookups")
+    }
+    assert lookups == {1: (200, 1971), 2: (200, None), 4: (200, 1985)}
+    years = {
+        row["discogs_master_id"]: row["master_year"]
+        for row in conn.execute("SELECT discogs_master_id, master_year FROM albums")
+    }
+    assert years == {1: 1971, 2: None, 4: 1985, 99999: None}
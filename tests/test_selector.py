@@ -0,0 +1,122 @@
+import json
+import random
+from datetime import datetime, timezone
+
+import numpy as np
+
+import selector
+
+NOW = datetime(2024, 6, 1, 12, 30, 15, 250000, tzinfo=timezone.utc)
+GENRES = ["Rock", "Jazz", "Funk / Soul", "Electronic", "Hip Hop", "Reggae", "Blues"]
+
+
+def make_collection(conn, n_albums=400, seed=2):
+    """Synthetic collection with Big Board ranks, exclusions and listens."""
+    rnd = random.Random(seed)
+    artists = [f"Artist {i}" for i in range(n_albums // 4)]
+    albums = []
+    for i in range(1, n_albums + 1):
+        genres = rnd.sample(GENRES, rnd.randint(0, 3))
+        albums.append((
+            i, 1_000_000 + i, rnd.choice(artists), f"Album {i}",
+            rnd.choice([None, 0, rnd.randint(1955, 2024)]),
+            rnd.choice([None, 0, rnd.randint(1955, 2024)]),
+            rnd.choice([None] * 9 + [rnd.randint(1955, 2024)]),
+            rnd.choice([json.dumps(genres), json.dumps(genres), "", None]),
+            int(rnd.random() < 0.05),
+            int(rnd.random() < 0.05),
+        ))
+    conn.executemany(
+        """INSERT INTO albums (id, discogs_release_id, artist, title, release_year,
+               master_year, master_year_override, genres, is_excluded, is_removed)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        albums,
+    )
+
+    ranked = rnd.sample(range(1, n_albums + 1), n_albums // 3)
+    conn.executemany(
+        "INSERT INTO big_board_entries (rank, artist, title, year, album_id) VALUES (?, ?, ?, ?, ?)",
+        [
+            (rank, "x", "y", rnd.choice([None, rnd.randint(1955, 2024)]), album_id)
+            for rank, album_id in enumerate(ranked, start=1)
+        ],
+    )
+
+    listens = []
+    for album_id in rnd.sample(range(1, n_albums + 1), n_albums // 2):
+        for _ in range(rnd.randint(1, 3)):
+            selected = datetime.fromtimestamp(
+                NOW.timestamp() - rnd.uniform(-3600, 400 * 86400), timezone.utc
+            )
+            listens.append((album_id, selected.strftime("%Y-%m-%d %H:%M:%S")))
+    conn.executemany("INSERT INTO listens (album_id, selected_at) VALUES (?, ?)", listens)
+    conn.commit()
+
+
+def test_calculate_weights_matches_reference(conn):
+    make_collection(conn)
+
+    reference = selector.calculate_weights_reference(conn, now=NOW)
+    columnar = selector.calculate_weights(conn, now=NOW)
+
+    assert [album["id"] for album, _ in columnar] == [album["id"] for album, _ in reference]
+    np.testing.assert_allclose(
+        [weight for _, weight in columnar], [weight for _, weight in reference], rtol=1e-12, atol=0
+    )
+
+
+def test_calculate_weights_empty_collection(conn):
+    assert selector.calculate_weights(conn, now=NOW) == []
+
+
+def test_sampler_envelope_matches_per_slot_envelope(conn):
+    make_collection(conn)
+    sampler = selector.SelectionSampler()
+    sampler._build(conn)
+
+    expected = [sampler._envelope(i) for i in range(len(sampler.slot_albums))]
+    np.testing.assert_allclose(sampler.tree.values, expected, rtol=1e-9, atol=0)
+    assert np.isclose(sampler.tree.total(), sum(expected))
+
+
+def test_fenwick_tree_prefix_sums():
+    values = [random.Random(i).choice([0.0, 0.5, 1.25, 3.0]) for i in range(37)]
+    tree = selector._FenwickTree(values)
+    for end in range(len(values) + 1):
+        total, i = 0.0, end
+        while i > 0:
+            total += tree.tree[i]
+            i -= i & -i
+        assert np.isclose(total, sum(values[:end]))
+
+
+def test_sampler_picks_only_selectable_albums(conn):
+    make_collection(conn)
+    selectable = {album["id"]: album for album in selector.get_eligible_albums(conn)}
+    sampler = selector.SelectionSampler()
+
+    for _ in range(50):
+        picked = sampler.pick(conn)
+        assert picked["id"] in selectable
+        sampler.record_selection(picked["id"])
+
+
+def test_batch_never_repeats_an_album(conn):
+    conn.executemany(
+        "INSERT INTO albums (id, discogs_release_id, artist, title) VALUES (?, ?, ?, ?)",
+        [(i, 1000 + i, f"Artist {i}", f"Album {i}") for i in (1, 2, 3)],
+    )
+    conn.commit()
+    selector.sampler.invalidate()
+
+    picks = [album["album_id"] for album in selector.select_next_albums(5)]
+
+    assert sorted(picks) == [1, 2, 3]
+
+
+def test_next_rejects_non_integer_count(conn):
+    import app
+
+    client = app.app.test_client()
+    assert client.get("/api/next?count=abc").status_code == 400
+    assert client.get("/api/next?count=0").status_code == 400